@@ -8,3 +8,5 @@ class AssetConfig(AppConfig):
     def ready(self):
         # 导入所有模型以确保Django发现并注册
         from . import models
+        # 注册信号接收器
+        from . import receivers  # noqa: F401
@@ -19,6 +19,7 @@ class Subdomain(models.Model):
         'targets.Target',  # 使用字符串引用避免循环导入
         on_delete=models.CASCADE,
         related_name='subdomains',
+        db_index=False,  # 唯一约束 (target, name) 的索引已覆盖 target_id 查询，不再创建隐式单列索引
         help_text='所属的扫描目标（主关联字段，表示所属关系，不能为空）'
     )
     name = models.CharField(max_length=1000, help_text='子域名名称')
@@ -31,14 +32,13 @@ class Subdomain(models.Model):
         ordering = ['-created_at']
         indexes = [
             models.Index(fields=['-created_at']),
-            models.Index(fields=['name', 'target']),  # 复合索引，优化 get_by_names_and_target_id 批量查询
-            models.Index(fields=['target']),     # 优化从target_id快速查找下面的子域名
-            models.Index(fields=['name']),            # 优化从name快速查找子域名，搜索场景
+            models.Index(fields=['name', 'target']),  # 复合索引，优化 get_by_names_and_target_id 批量查询，兼顾 name 前缀查询
         ]
         constraints = [
-            # 普通唯一约束：name + target 组合唯一
+            # 普通唯一约束：target + name 组合唯一
+            # target 在前，唯一索引同时服务 filter(target_id=...) 查询，无需单独的 target 索引
             models.UniqueConstraint(
-                fields=['name', 'target'],
+                fields=['target', 'name'],
                 name='unique_subdomain_name_target'
             )
         ]
@@ -55,6 +55,7 @@ class Endpoint(models.Model):
         'targets.Target',  # 使用字符串引用
         on_delete=models.CASCADE,
         related_name='endpoints',
+        db_index=False,  # Meta.indexes 已显式声明 target 索引，避免重复的隐式索引
         help_text='所属的扫描目标（主关联字段，表示所属关系，不能为空）'
     )
     
@@ -157,6 +158,7 @@ class WebSite(models.Model):
         'targets.Target',  # 使用字符串引用
         on_delete=models.CASCADE,
         related_name='websites',
+        db_index=False,  # Meta.indexes 已显式声明 target 索引，避免重复的隐式索引
         help_text='所属的扫描目标（主关联字段，表示所属关系，不能为空）'
     )
 
@@ -255,6 +257,7 @@ class Directory(models.Model):
         'targets.Target',
         on_delete=models.CASCADE,
         related_name='directories',
+        db_index=False,  # 唯一约束 (target, url) 的索引已覆盖 target_id 查询，不再创建隐式单列索引
         help_text='所属的扫描目标'
     )
     
@@ -305,7 +308,13 @@ class Directory(models.Model):
         ordering = ['-created_at']
         indexes = [
             models.Index(fields=['-created_at']),
-            models.Index(fields=['target']),     # 优化从target_id快速查找下面的目录
+            # 覆盖索引：get_by_target 按 target 过滤并按 -created_at 排序，可走 index-only scan
+            # 按 target 过滤 + url 排序的导出由唯一约束 (target, url) 的索引服务
+            models.Index(
+                fields=['target', '-created_at'],
+                include=['url'],
+                name='dir_target_created_url_idx'
+            ),
             models.Index(fields=['url']),        # URL索引，优化搜索和唯一约束
             models.Index(fields=['status']),     # 状态码索引，优化筛选
         ]
@@ -338,6 +347,7 @@ class HostPortMapping(models.Model):
         'targets.Target',
         on_delete=models.CASCADE,
         related_name='host_port_mappings',
+        db_index=False,  # hpm_target_ip_idx 与唯一约束的索引已覆盖 target_id 查询，不再创建隐式单列索引
         help_text='所属的扫描目标'
     )
     
@@ -345,6 +355,7 @@ class HostPortMapping(models.Model):
     host = models.CharField(
         max_length=1000,
         blank=False,
+        db_collation='C',  # 字节序排序：IP 聚合 array_agg(ORDER BY host) 与 host 排序更快，主机名均为 ASCII
         help_text='主机名（域名或IP）'
     )
     ip = models.GenericIPAddressField(
@@ -372,11 +383,11 @@ class HostPortMapping(models.Model):
         verbose_name_plural = '主机端口映射'
         ordering = ['-created_at']
         indexes = [
-            models.Index(fields=['target']),           # 优化按目标查询
-            models.Index(fields=['host']),             # 优化按主机名查询
+            # 优化按目标查询 IP（get_ips_for_export 的 DISTINCT ip 可走 index-only scan），兼顾按目标查询
+            models.Index(fields=['target', 'ip'], name='hpm_target_ip_idx'),
             models.Index(fields=['ip']),               # 优化按IP查询
             models.Index(fields=['port']),             # 优化按端口查询
-            models.Index(fields=['host', 'ip']),       # 优化组合查询
+            models.Index(fields=['host', 'ip']),       # 优化组合查询，兼顾按主机名查询
             models.Index(fields=['-created_at']),   # 优化时间排序
         ]
         constraints = [
@@ -407,6 +418,7 @@ class Vulnerability(models.Model):
         'targets.Target',
         on_delete=models.CASCADE,
         related_name='vulnerabilities',
+        db_index=False,  # Meta.indexes 已显式声明 target 索引，避免重复的隐式索引
         help_text='所属的扫描目标'
     )
     
@@ -422,7 +434,7 @@ class Vulnerability(models.Model):
     source = models.CharField(max_length=50, blank=True, default='', help_text='来源工具（如 dalfox, nuclei, crlfuzz）')
     cvss_score = models.DecimalField(max_digits=3, decimal_places=1, null=True, blank=True, help_text='CVSS 评分（0.0-10.0）')
     description = models.TextField(blank=True, default='', help_text='漏洞描述')
-    raw_output = models.JSONField(blank=True, default=dict, help_text='工具原始输出')
+    raw_output = models.JSONField(null=True, blank=True, help_text='工具原始输出（为空时为 NULL）')
     
     # ==================== 时间字段 ====================
     created_at = models.DateTimeField(auto_now_add=True, help_text='创建时间')
@@ -11,6 +11,7 @@ class SubdomainSnapshot(models.Model):
         'scan.Scan',
         on_delete=models.CASCADE,
         related_name='subdomain_snapshots',
+        db_index=False,  # 唯一约束 (scan, name) 的索引已覆盖 scan_id 查询，不再创建隐式单列索引
         help_text='所属的扫描任务'
     )
     
@@ -23,7 +24,6 @@ class SubdomainSnapshot(models.Model):
         verbose_name_plural = '子域名快照'
         ordering = ['-created_at']
         indexes = [
-            models.Index(fields=['scan']),
             models.Index(fields=['name']),
             models.Index(fields=['-created_at']),
         ]
@@ -50,6 +50,7 @@ class WebsiteSnapshot(models.Model):
         'scan.Scan',
         on_delete=models.CASCADE,
         related_name='website_snapshots',
+        db_index=False,  # 唯一约束 (scan, url) 的索引已覆盖 scan_id 查询，不再创建隐式单列索引
         help_text='所属的扫描任务'
     )
     
@@ -78,7 +79,6 @@ class WebsiteSnapshot(models.Model):
         verbose_name_plural = '网站快照'
         ordering = ['-created_at']
         indexes = [
-            models.Index(fields=['scan']),
             models.Index(fields=['url']),
             models.Index(fields=['host']),  # host索引，优化根据主机名查询
             models.Index(fields=['title']),  # title索引，优化标题搜索
@@ -108,6 +108,7 @@ class DirectorySnapshot(models.Model):
         'scan.Scan',
         on_delete=models.CASCADE,
         related_name='directory_snapshots',
+        db_index=False,  # 唯一约束 (scan, url) 的索引已覆盖 scan_id 查询，不再创建隐式单列索引
         help_text='所属的扫描任务'
     )
     
@@ -127,7 +128,6 @@ class DirectorySnapshot(models.Model):
         verbose_name_plural = '目录快照'
         ordering = ['-created_at']
         indexes = [
-            models.Index(fields=['scan']),
             models.Index(fields=['url']),
             models.Index(fields=['status']),  # 状态码索引，优化筛选
             models.Index(fields=['content_type']),  # content_type索引，优化内容类型搜索
@@ -162,6 +162,7 @@ class HostPortMappingSnapshot(models.Model):
         'scan.Scan',
         on_delete=models.CASCADE,
         related_name='host_port_mapping_snapshots',
+        db_index=False,  # 唯一约束 (scan, host, ip, port) 的索引已覆盖 scan_id 查询，不再创建隐式单列索引
         help_text='所属的扫描任务（主关联）'
     )
     
@@ -169,6 +170,7 @@ class HostPortMappingSnapshot(models.Model):
     host = models.CharField(
         max_length=1000,
         blank=False,
+        db_collation='C',  # 字节序排序：IP 聚合 array_agg(ORDER BY host) 与 host 排序更快，主机名均为 ASCII
         help_text='主机名（域名或IP）'
     )
     ip = models.GenericIPAddressField(
@@ -196,7 +198,6 @@ class HostPortMappingSnapshot(models.Model):
         verbose_name_plural = '主机端口映射快照'
         ordering = ['-created_at']
         indexes = [
-            models.Index(fields=['scan']),             # 优化按扫描查询
             models.Index(fields=['host']),             # 优化按主机名查询
             models.Index(fields=['ip']),               # 优化按IP查询
             models.Index(fields=['port']),             # 优化按端口查询
@@ -228,6 +229,7 @@ class EndpointSnapshot(models.Model):
         'scan.Scan',
         on_delete=models.CASCADE,
         related_name='endpoint_snapshots',
+        db_index=False,  # 唯一约束 (scan, url) 的索引已覆盖 scan_id 查询，不再创建隐式单列索引
         help_text='所属的扫描任务'
     )
     
@@ -267,7 +269,6 @@ class EndpointSnapshot(models.Model):
         verbose_name_plural = '端点快照'
         ordering = ['-created_at']
         indexes = [
-            models.Index(fields=['scan']),
             models.Index(fields=['url']),
             models.Index(fields=['host']),  # host索引，优化根据主机名查询
             models.Index(fields=['title']),  # title索引，优化标题搜索
@@ -302,6 +303,7 @@ class VulnerabilitySnapshot(models.Model):
         'scan.Scan',
         on_delete=models.CASCADE,
         related_name='vulnerability_snapshots',
+        db_index=False,  # Meta.indexes 已显式声明 scan 索引，避免重复的隐式索引
         help_text='所属的扫描任务'
     )
     
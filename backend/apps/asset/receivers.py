@@ -0,0 +1,20 @@
+"""资产模块信号接收器
+
+单条保存 HostPortMapping 时使对应目标的 IP 聚合缓存失效。
+批量写入（COPY）不会触发模型信号，由 HostPortMappingService 显式失效。
+
+不监听 post_delete：HostPortMapping 只随 Target 级联删除，目标删除后无需失效；
+且 post_delete 接收器会关闭级联快速删除，导致每行映射都被加载到内存并逐条删除。
+"""
+
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from apps.asset.models import HostPortMapping
+from apps.asset.services.asset.host_port_mapping_service import invalidate_ip_aggregation_cache
+
+
+@receiver(post_save, sender=HostPortMapping)
+def on_host_port_mapping_changed(sender, instance, **kwargs):
+    """HostPortMapping 保存后使目标的 IP 聚合缓存失效"""
+    invalidate_ip_aggregation_cache(instance.target_id)
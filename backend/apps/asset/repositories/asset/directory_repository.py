@@ -3,72 +3,95 @@ Django ORM 实现的 Directory Repository
 """
 
 import logging
-from typing import List, Iterator
-from django.db import transaction
+from itertools import islice
+from operator import attrgetter
+from typing import Iterable, List, Iterator
+from django.db import connection, transaction
 
 from apps.asset.models.asset_models import Directory
 from apps.asset.dtos import DirectoryDTO
 from apps.common.decorators import auto_ensure_db_connection
-from apps.common.utils import deduplicate_for_bulk
+from apps.common.utils import deduplicate_for_bulk, model_factory
 
 logger = logging.getLogger(__name__)
 
+# 列式数组 upsert：参数个数与行数无关，语句文本固定，避免逐行构建 Model
+_BULK_UPSERT_SQL = """
+    INSERT INTO directory (
+        target_id, url, status, content_length, words,
+        lines, content_type, duration, created_at
+    )
+    SELECT
+        t.target_id, t.url, t.status, t.content_length, t.words,
+        t.lines, COALESCE(t.content_type, ''), t.duration, NOW()
+    FROM unnest(
+        %s::integer[], %s::text[], %s::integer[], %s::bigint[], %s::integer[],
+        %s::integer[], %s::text[], %s::bigint[]
+    ) AS t(target_id, url, status, content_length, words, lines, content_type, duration)
+    ON CONFLICT (target_id, url) DO UPDATE SET
+        status = EXCLUDED.status,
+        content_length = EXCLUDED.content_length,
+        words = EXCLUDED.words,
+        lines = EXCLUDED.lines,
+        content_type = EXCLUDED.content_type,
+        duration = EXCLUDED.duration
+"""
+
+# 与 _BULK_UPSERT_SQL 中 unnest 参数顺序一致
+_UPSERT_ROW = attrgetter(
+    'target_id', 'url', 'status', 'content_length', 'words',
+    'lines', 'content_type', 'duration'
+)
+
+# DTO → Directory 专用构造函数（导入期生成一次）
+_make_directory = model_factory(Directory, (
+    'target_id', 'url', 'status', 'content_length', 'words',
+    'lines', 'content_type', 'duration'
+))
+
 
 @auto_ensure_db_connection
 class DjangoDirectoryRepository:
     """Django ORM 实现的 Directory Repository"""
 
-    def bulk_upsert(self, items: List[DirectoryDTO]) -> int:
+    def bulk_upsert(self, items: Iterable[DirectoryDTO], batch_size: int = 1000) -> int:
         """
         批量创建或更新 Directory（upsert）
         
         存在则更新所有字段，不存在则创建。
-        使用 Django 原生 update_conflicts。
+        使用 INSERT ... SELECT FROM unnest(...) ON CONFLICT DO UPDATE，
+        按列传入数组，不实例化 Model。
         
-        注意：自动按模型唯一约束去重，保留最后一条记录。
+        接受任意可迭代对象（如生成器），按 batch_size 分批消费，
+        峰值内存只与单批大小相关。
+        
+        注意：每批内自动按模型唯一约束去重，保留最后一条记录。
+        事务边界由调用方控制（如快照同步在同一事务内调用）。
         
         Args:
-            items: Directory DTO 列表
+            items: Directory DTO 可迭代对象
+            batch_size: 每批写入数量
             
         Returns:
             int: 处理的记录数
         """
-        if not items:
-            return 0
+        total = 0
+        items_iter = iter(items)
         
         try:
-            # 自动按模型唯一约束去重
-            unique_items = deduplicate_for_bulk(items, Directory)
-            
-            # 直接从 DTO 字段构建 Model
-            directories = [
-                Directory(
-                    target_id=item.target_id,
-                    url=item.url,
-                    status=item.status,
-                    content_length=item.content_length,
-                    words=item.words,
-                    lines=item.lines,
-                    content_type=item.content_type or '',
-                    duration=item.duration
-                )
-                for item in unique_items
-            ]
-            
-            with transaction.atomic():
-                Directory.objects.bulk_create(
-                    directories,
-                    update_conflicts=True,
-                    unique_fields=['target', 'url'],
-                    update_fields=[
-                        'status', 'content_length', 'words',
-                        'lines', 'content_type', 'duration'
-                    ],
-                    batch_size=1000
-                )
+            while batch := list(islice(items_iter, batch_size)):
+                # 自动按模型唯一约束去重
+                unique_items = deduplicate_for_bulk(batch, Directory)
+                
+                # 行转列：attrgetter 一次取出整行，zip 转置为列数组
+                params = [list(column) for column in zip(*map(_UPSERT_ROW, unique_items))]
+                
+                with connection.cursor() as cursor:
+                    cursor.execute(_BULK_UPSERT_SQL, params)
+                total += len(unique_items)
             
-            logger.debug(f"批量 upsert Directory 成功: {len(unique_items)} 条")
-            return len(unique_items)
+            logger.debug(f"批量 upsert Directory 成功: {total} 条")
+            return total
                 
         except Exception as e:
             logger.error(f"批量 upsert Directory 失败: {e}")
@@ -96,19 +119,7 @@ class DjangoDirectoryRepository:
             # 自动按模型唯一约束去重
             unique_items = deduplicate_for_bulk(items, Directory)
             
-            directories = [
-                Directory(
-                    target_id=item.target_id,
-                    url=item.url,
-                    status=item.status,
-                    content_length=item.content_length,
-                    words=item.words,
-                    lines=item.lines,
-                    content_type=item.content_type or '',
-                    duration=item.duration
-                )
-                for item in unique_items
-            ]
+            directories = list(map(_make_directory, unique_items))
             
             with transaction.atomic():
                 Directory.objects.bulk_create(
@@ -137,17 +148,20 @@ class DjangoDirectoryRepository:
         return Directory.objects.filter(target_id=target_id).order_by('-created_at')
 
     def get_urls_for_export(self, target_id: int, batch_size: int = 1000) -> Iterator[str]:
-        """流式导出目标下的所有目录 URL"""
+        """
+        流式导出目标下的所有目录 URL
+        
+        使用服务端游标 + 原生 SQL，按批 fetchmany，跳过 QuerySet 行包装。
+        """
         try:
-            queryset = (
-                Directory.objects
-                .filter(target_id=target_id)
-                .values_list('url', flat=True)
-                .order_by('url')
-                .iterator(chunk_size=batch_size)
-            )
-            for url in queryset:
-                yield url
+            with connection.chunked_cursor() as cursor:
+                cursor.execute(
+                    'SELECT url FROM directory WHERE target_id = %s ORDER BY url',
+                    [target_id]
+                )
+                while rows := cursor.fetchmany(batch_size):
+                    for (url,) in rows:
+                        yield url
         except Exception as e:
             logger.error("流式导出目录 URL 失败 - Target ID: %s, 错误: %s", target_id, e)
             raise
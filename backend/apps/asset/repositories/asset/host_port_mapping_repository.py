@@ -1,14 +1,16 @@
 """HostPortMapping Repository - Django ORM 实现"""
 
 import logging
+from operator import attrgetter
 from typing import List, Iterator, Dict, Optional
 
+from django.db import connection
 from django.db.models import QuerySet, Min
 
 from apps.asset.models.asset_models import HostPortMapping
 from apps.asset.dtos.asset import HostPortMappingDTO
 from apps.common.decorators import auto_ensure_db_connection
-from apps.common.utils import deduplicate_for_bulk
+from apps.common.utils import deduplicate_for_bulk, copy_insert_ignore_conflicts
 
 logger = logging.getLogger(__name__)
 
@@ -42,22 +44,14 @@ class DjangoHostPortMappingRepository:
             # 自动按模型唯一约束去重
             unique_items = deduplicate_for_bulk(items, HostPortMapping)
                 
-            records = [
-                HostPortMapping(
-                    target_id=item.target_id,
-                    host=item.host,
-                    ip=item.ip,
-                    port=item.port
-                )
-                for item in unique_items
-            ]
-            
-            created = HostPortMapping.objects.bulk_create(
-                records, 
-                ignore_conflicts=True
+            # COPY 写入临时表后 INSERT ... ON CONFLICT (唯一约束列) DO NOTHING 合并
+            fields = ('target_id', 'host', 'ip', 'port')
+            created_count = copy_insert_ignore_conflicts(
+                HostPortMapping,
+                fields,
+                map(attrgetter(*fields), unique_items),
+                conflict_fields=fields,
             )
-            
-            created_count = len(created) if created else 0
             logger.debug("主机端口关联创建完成 - 数量: %d", created_count)
             
             return created_count
@@ -83,17 +77,15 @@ class DjangoHostPortMappingRepository:
             yield item
 
     def get_ips_for_export(self, target_id: int, batch_size: int = 1000) -> Iterator[str]:
-        """流式导出目标下的所有唯一 IP 地址。"""
-        queryset = (
-            HostPortMapping.objects
-            .filter(target_id=target_id)
-            .values_list("ip", flat=True)
-            .distinct()
-            .order_by("ip")
-            .iterator(chunk_size=batch_size)
-        )
-        for ip in queryset:
-            yield ip
+        """流式导出目标下的所有唯一 IP 地址（服务端游标 + 原生 SQL）。"""
+        with connection.chunked_cursor() as cursor:
+            cursor.execute(
+                'SELECT DISTINCT ip FROM host_port_mapping WHERE target_id = %s ORDER BY ip',
+                [target_id]
+            )
+            while rows := cursor.fetchmany(batch_size):
+                for (ip,) in rows:
+                    yield ip
 
     def get_queryset_by_target(self, target_id: int) -> QuerySet:
         """获取目标下的 QuerySet"""
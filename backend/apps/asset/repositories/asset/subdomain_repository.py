@@ -1,17 +1,22 @@
 """Subdomain Repository - Django ORM 实现"""
 
 import logging
+from itertools import islice
+from operator import attrgetter
 from typing import List, Iterator
 
-from django.db import transaction
+from django.db import connection, transaction
 
 from apps.asset.models.asset_models import Subdomain
 from apps.asset.dtos import SubdomainDTO
 from apps.common.decorators import auto_ensure_db_connection
-from apps.common.utils import deduplicate_for_bulk
+from apps.common.utils import deduplicate_for_bulk, copy_insert_ignore_conflicts
 
 logger = logging.getLogger(__name__)
 
+# 单次 IN (...) 查询的最大域名数，避免超大 IN 列表导致规划器退化和解析开销
+NAMES_QUERY_CHUNK_SIZE = 2000
+
 
 @auto_ensure_db_connection
 class DjangoSubdomainRepository:
@@ -33,18 +38,13 @@ class DjangoSubdomainRepository:
             # 自动按模型唯一约束去重
             unique_items = deduplicate_for_bulk(items, Subdomain)
             
-            subdomain_objects = [
-                Subdomain(
-                    name=item.name,
-                    target_id=item.target_id,
-                )
-                for item in unique_items
-            ]
-
+            # COPY 写入临时表后 INSERT ... ON CONFLICT (唯一约束列) DO NOTHING 合并
             with transaction.atomic():
-                Subdomain.objects.bulk_create(
-                    subdomain_objects,
-                    ignore_conflicts=True,
+                copy_insert_ignore_conflicts(
+                    Subdomain,
+                    ('name', 'target_id'),
+                    map(attrgetter('name', 'target_id'), unique_items),
+                    conflict_fields=('name', 'target_id'),
                 )
 
             logger.debug(f"成功处理 {len(unique_items)} 条子域名记录")
@@ -66,22 +66,49 @@ class DjangoSubdomainRepository:
         return Subdomain.objects.filter(target_id=target_id).count()
     
     def get_domains_for_export(self, target_id: int, batch_size: int = 1000) -> Iterator[str]:
-        """流式导出域名"""
-        queryset = Subdomain.objects.filter(
-            target_id=target_id
-        ).only('name').iterator(chunk_size=batch_size)
-        
-        for subdomain in queryset:
-            yield subdomain.name
+        """流式导出域名（服务端游标 + 原生 SQL，跳过 Model 实例化）"""
+        with connection.chunked_cursor() as cursor:
+            cursor.execute(
+                'SELECT name FROM subdomain WHERE target_id = %s',
+                [target_id]
+            )
+            while rows := cursor.fetchmany(batch_size):
+                for (name,) in rows:
+                    yield name
     
     def get_by_names_and_target_id(self, names: set, target_id: int) -> dict:
-        """根据域名列表和目标ID批量查询 Subdomain"""
-        subdomains = Subdomain.objects.filter(
-            name__in=names,
-            target_id=target_id
-        ).only('id', 'name')
+        """
+        根据域名列表和目标ID批量查询 Subdomain
+        
+        按 NAMES_QUERY_CHUNK_SIZE 分批查询后合并，保持走 (name, target) 复合索引。
+        """
+        result = {}
+        names_iter = iter(names)
+        while chunk := list(islice(names_iter, NAMES_QUERY_CHUNK_SIZE)):
+            subdomains = Subdomain.objects.filter(
+                name__in=chunk,
+                target_id=target_id
+            ).only('id', 'name')
+            result.update({sd.name: sd for sd in subdomains})
+        
+        return result
+
+    def get_id_map_by_names_and_target_id(self, names: set, target_id: int) -> dict:
+        """
+        根据域名列表和目标ID批量查询 {域名: ID}
+        
+        只需要 ID 时使用：values_list 返回元组，不实例化 Model。
+        """
+        result = {}
+        names_iter = iter(names)
+        while chunk := list(islice(names_iter, NAMES_QUERY_CHUNK_SIZE)):
+            rows = Subdomain.objects.filter(
+                name__in=chunk,
+                target_id=target_id
+            ).values_list('name', 'id').iterator()
+            result.update(rows)
         
-        return {sd.name: sd for sd in subdomains}
+        return result
 
     def iter_raw_data_for_export(
         self, 
@@ -1,8 +1,9 @@
 """Directory Snapshot Repository - 目录快照数据访问层"""
 
 import logging
-from typing import List, Iterator
-from django.db import transaction
+from operator import attrgetter
+from typing import List, Iterator, Set
+from django.db import connection
 
 from apps.asset.models import DirectorySnapshot
 from apps.asset.dtos.snapshot import DirectorySnapshotDTO
@@ -11,6 +12,40 @@ from apps.common.utils import deduplicate_for_bulk
 
 logger = logging.getLogger(__name__)
 
+# 单条语句完成：过滤已删除/不存在的 Scan + 列式数组插入快照 + 返回仍存在的 scan_id
+# 存在性检查与写入在同一语句内，省去一次往返，也避免检查后被删除的竞态
+_SAVE_SNAPSHOTS_SQL = """
+    WITH live AS (
+        SELECT id FROM scan
+        WHERE id = ANY(%s::integer[]) AND deleted_at IS NULL
+    ),
+    ins AS (
+        INSERT INTO directory_snapshot (
+            scan_id, url, status, content_length, words,
+            lines, content_type, duration, created_at
+        )
+        SELECT
+            t.scan_id, t.url, t.status, t.content_length, t.words,
+            t.lines, COALESCE(t.content_type, ''), t.duration, NOW()
+        FROM unnest(
+            %s::integer[], %s::text[], %s::integer[], %s::bigint[], %s::integer[],
+            %s::integer[], %s::text[], %s::bigint[]
+        ) AS t(scan_id, url, status, content_length, words, lines, content_type, duration)
+        WHERE t.scan_id IN (SELECT id FROM live)
+        ON CONFLICT (scan_id, url) DO NOTHING
+        RETURNING 1
+    )
+    SELECT
+        (SELECT COALESCE(array_agg(id), '{}') FROM live),
+        (SELECT count(*) FROM ins)
+"""
+
+# 与 _SAVE_SNAPSHOTS_SQL 中 unnest 参数顺序一致
+_SNAPSHOT_ROW = attrgetter(
+    'scan_id', 'url', 'status', 'content_length', 'words',
+    'lines', 'content_type', 'duration'
+)
+
 
 @auto_ensure_db_connection
 class DjangoDirectorySnapshotRepository:
@@ -20,53 +55,45 @@ class DjangoDirectorySnapshotRepository:
     负责目录快照表的数据访问操作
     """
     
-    def save_snapshots(self, items: List[DirectorySnapshotDTO]) -> None:
+    def save_snapshots(self, items: List[DirectorySnapshotDTO]) -> Set[int]:
         """
         批量保存目录快照记录
         
-        使用 ignore_conflicts 策略，如果快照已存在（相同 scan + url）则跳过
+        使用 ignore_conflicts 策略，如果快照已存在（相同 scan + url）则跳过。
+        只写入所属 Scan 仍存在（未软删除）的记录，存在性检查与插入在同一条 SQL 中完成。
         
         注意：会自动按 (scan_id, url) 去重，保留最后一条记录。
         
         Args:
             items: 目录快照 DTO 列表
         
+        Returns:
+            Set[int]: 仍存在的 scan_id 集合（为空表示 Scan 均已删除，未写入任何记录）
+        
         Raises:
-            ValueError: items 为空
             Exception: 数据库操作失败
         """
         if not items:
             logger.warning("目录快照列表为空，跳过保存")
-            return
+            return set()
         
         try:
             # 根据模型唯一约束自动去重
             unique_items = deduplicate_for_bulk(items, DirectorySnapshot)
             
-            # 转换为 Django 模型对象
-            snapshot_objects = [
-                DirectorySnapshot(
-                    scan_id=item.scan_id,
-                    url=item.url,
-                    status=item.status,
-                    content_length=item.content_length,
-                    words=item.words,
-                    lines=item.lines,
-                    content_type=item.content_type,
-                    duration=item.duration
-                )
-                for item in unique_items
-            ]
+            # 行转列：attrgetter 一次取出整行，zip 转置为列数组
+            columns = [list(column) for column in zip(*map(_SNAPSHOT_ROW, unique_items))]
+            scan_ids = list(set(columns[0]))
             
-            with transaction.atomic():
-                # 批量插入，忽略冲突
-                # 如果 scan + url 已存在，跳过
-                DirectorySnapshot.objects.bulk_create(
-                    snapshot_objects,
-                    ignore_conflicts=True
-                )
+            # 单条语句本身是原子的，事务边界由调用方统一控制
+            with connection.cursor() as cursor:
+                cursor.execute(_SAVE_SNAPSHOTS_SQL, [scan_ids, *columns])
+                live_scan_ids, inserted = cursor.fetchone()
             
-            logger.debug("成功保存 %d 条目录快照记录", len(unique_items))
+            logger.debug(
+                "成功保存目录快照记录 - 提交: %d, 插入: %d", len(unique_items), inserted
+            )
+            return set(live_scan_ids)
             
         except Exception as e:
             logger.error(
@@ -3,13 +3,20 @@
 import logging
 from typing import List, Iterator
 
+from django.contrib.postgres.aggregates import ArrayAgg
+from django.db.models import Min
+
 from apps.asset.models.snapshot_models import HostPortMappingSnapshot
 from apps.asset.dtos.snapshot import HostPortMappingSnapshotDTO
 from apps.common.decorators import auto_ensure_db_connection
-from apps.common.utils import deduplicate_for_bulk
+from apps.common.utils import deduplicate_for_bulk, model_factory
+from apps.common.utils.filter_utils import apply_filters
 
 logger = logging.getLogger(__name__)
 
+# DTO → HostPortMappingSnapshot 专用构造函数（导入期生成一次）
+_make_snapshot = model_factory(HostPortMappingSnapshot, ('scan_id', 'host', 'ip', 'port'))
+
 
 @auto_ensure_db_connection
 class DjangoHostPortMappingSnapshotRepository:
@@ -39,14 +46,7 @@ class DjangoHostPortMappingSnapshotRepository:
             unique_items = deduplicate_for_bulk(items, HostPortMappingSnapshot)
                 
             # 构建快照对象
-            snapshots = []
-            for item in unique_items:
-                snapshots.append(HostPortMappingSnapshot(
-                    scan_id=item.scan_id,
-                    host=item.host,
-                    ip=item.ip,
-                    port=item.port
-                ))
+            snapshots = list(map(_make_snapshot, unique_items))
             
             # 批量创建（忽略冲突，基于唯一约束去重）
             HostPortMappingSnapshot.objects.bulk_create(
@@ -66,58 +66,21 @@ class DjangoHostPortMappingSnapshotRepository:
             raise
     
     def get_ip_aggregation_by_scan(self, scan_id: int, filter_query: str = None):
-        from django.db.models import Min
-        from apps.common.utils.filter_utils import apply_filters
-
         qs = HostPortMappingSnapshot.objects.filter(scan_id=scan_id)
-        
-        # 应用智能过滤
-        if filter_query:
-            field_mapping = {
-                'ip': 'ip',
-                'port': 'port',
-                'host': 'host',
-            }
-            qs = apply_filters(qs, filter_query, field_mapping)
-
-        ip_aggregated = (
-            qs
-            .values('ip')
-            .annotate(
-                created_at=Min('created_at')
-            )
-            .order_by('-created_at')
-        )
-
-        results = []
-        for item in ip_aggregated:
-            ip = item['ip']
-            mappings = (
-                HostPortMappingSnapshot.objects
-                .filter(scan_id=scan_id, ip=ip)
-                .values('host', 'port')
-                .distinct()
-            )
-
-            hosts = sorted({m['host'] for m in mappings})
-            ports = sorted({m['port'] for m in mappings})
-
-            results.append({
-                'ip': ip,
-                'hosts': hosts,
-                'ports': ports,
-                'created_at': item['created_at'],
-            })
-
-        return results
+        return self._aggregate_by_ip(qs, filter_query)
 
     def get_all_ip_aggregation(self, filter_query: str = None):
         """获取所有 IP 聚合数据"""
-        from django.db.models import Min
-        from apps.common.utils.filter_utils import apply_filters
-
         qs = HostPortMappingSnapshot.objects.all()
+        return self._aggregate_by_ip(qs, filter_query)
+
+    def _aggregate_by_ip(self, qs, filter_query: str = None) -> List[dict]:
+        """
+        按 IP 聚合快照数据
         
+        单条 GROUP BY 查询完成聚合，hosts/ports 由 PostgreSQL array_agg 去重排序，
+        避免逐 IP 子查询（N+1）。
+        """
         # 应用智能过滤
         if filter_query:
             field_mapping = {
@@ -130,28 +93,23 @@ class DjangoHostPortMappingSnapshotRepository:
         ip_aggregated = (
             qs
             .values('ip')
-            .annotate(created_at=Min('created_at'))
+            .annotate(
+                created_at=Min('created_at'),
+                hosts=ArrayAgg('host', distinct=True, ordering='host'),
+                ports=ArrayAgg('port', distinct=True, ordering='port'),
+            )
             .order_by('-created_at')
         )
 
-        results = []
-        for item in ip_aggregated:
-            ip = item['ip']
-            mappings = (
-                HostPortMappingSnapshot.objects
-                .filter(ip=ip)
-                .values('host', 'port')
-                .distinct()
-            )
-            hosts = sorted({m['host'] for m in mappings})
-            ports = sorted({m['port'] for m in mappings})
-            results.append({
-                'ip': ip,
-                'hosts': hosts,
-                'ports': ports,
+        return [
+            {
+                'ip': item['ip'],
+                'hosts': item['hosts'],
+                'ports': item['ports'],
                 'created_at': item['created_at'],
-            })
-        return results
+            }
+            for item in ip_aggregated
+        ]
 
     def get_ips_for_export(self, scan_id: int, batch_size: int = 1000) -> Iterator[str]:
         """流式导出扫描下的所有唯一 IP 地址。"""
@@ -6,10 +6,13 @@ from typing import List, Iterator
 from apps.asset.models.snapshot_models import SubdomainSnapshot
 from apps.asset.dtos import SubdomainSnapshotDTO
 from apps.common.decorators import auto_ensure_db_connection
-from apps.common.utils import deduplicate_for_bulk
+from apps.common.utils import deduplicate_for_bulk, model_factory
 
 logger = logging.getLogger(__name__)
 
+# DTO → SubdomainSnapshot 专用构造函数（导入期生成一次）
+_make_snapshot = model_factory(SubdomainSnapshot, ('scan_id', 'name'))
+
 
 @auto_ensure_db_connection
 class DjangoSubdomainSnapshotRepository:
@@ -39,12 +42,7 @@ class DjangoSubdomainSnapshotRepository:
             unique_items = deduplicate_for_bulk(items, SubdomainSnapshot)
                 
             # 构建快照对象
-            snapshots = []
-            for item in unique_items:
-                snapshots.append(SubdomainSnapshot(
-                    scan_id=item.scan_id,
-                    name=item.name,
-                ))
+            snapshots = list(map(_make_snapshot, unique_items))
             
             # 批量创建（忽略冲突，基于唯一约束去重）
             SubdomainSnapshot.objects.bulk_create(snapshots, ignore_conflicts=True)
@@ -1,6 +1,7 @@
 """Vulnerability Snapshot Repository - 漏洞快照数据访问层"""
 
 import logging
+from operator import attrgetter
 from typing import List
 
 from django.db import transaction
@@ -8,10 +9,15 @@ from django.db import transaction
 from apps.asset.models import VulnerabilitySnapshot
 from apps.asset.dtos.snapshot import VulnerabilitySnapshotDTO
 from apps.common.decorators import auto_ensure_db_connection
-from apps.common.utils import deduplicate_for_bulk
+from apps.common.utils import deduplicate_for_bulk, values_insert_ignore_conflicts
 
 logger = logging.getLogger(__name__)
 
+_SNAPSHOT_FIELDS = (
+    'scan_id', 'url', 'vuln_type', 'severity', 'source',
+    'cvss_score', 'description', 'raw_output',
+)
+
 
 @auto_ensure_db_connection
 class DjangoVulnerabilitySnapshotRepository:
@@ -33,24 +39,12 @@ class DjangoVulnerabilitySnapshotRepository:
             # 根据模型唯一约束自动去重
             unique_items = deduplicate_for_bulk(items, VulnerabilitySnapshot)
             
-            snapshot_objects = [
-                VulnerabilitySnapshot(
-                    scan_id=item.scan_id,
-                    url=item.url,
-                    vuln_type=item.vuln_type,
-                    severity=item.severity,
-                    source=item.source,
-                    cvss_score=item.cvss_score,
-                    description=item.description,
-                    raw_output=item.raw_output,
-                )
-                for item in unique_items
-            ]
-
+            # execute_values 分页写入（raw_output 为 JSON，不适合 COPY / unnest）
             with transaction.atomic():
-                VulnerabilitySnapshot.objects.bulk_create(
-                    snapshot_objects,
-                    ignore_conflicts=True,
+                values_insert_ignore_conflicts(
+                    VulnerabilitySnapshot,
+                    _SNAPSHOT_FIELDS,
+                    map(attrgetter(*_SNAPSHOT_FIELDS), unique_items),
                 )
 
             logger.debug("成功保存 %d 条漏洞快照记录", len(unique_items))
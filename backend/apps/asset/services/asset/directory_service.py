@@ -1,7 +1,7 @@
 """Directory Service - 目录业务逻辑层"""
 
 import logging
-from typing import List, Iterator, Optional
+from typing import Iterable, List, Iterator, Optional
 
 from apps.asset.repositories import DjangoDirectoryRepository
 from apps.asset.dtos import DirectoryDTO
@@ -10,6 +10,9 @@ from apps.common.utils.filter_utils import apply_filters
 
 logger = logging.getLogger(__name__)
 
+# Repository 无状态，模块级共享一个实例，避免每次构造 Service 时重复创建
+_DIRECTORY_REPO = DjangoDirectoryRepository()
+
 
 class DirectoryService:
     """目录业务逻辑层"""
@@ -22,23 +25,20 @@ class DirectoryService:
     
     def __init__(self, repository=None):
         """初始化目录服务"""
-        self.repo = repository or DjangoDirectoryRepository()
+        self.repo = repository or _DIRECTORY_REPO
     
-    def bulk_upsert(self, directory_dtos: List[DirectoryDTO]) -> int:
+    def bulk_upsert(self, directory_dtos: Iterable[DirectoryDTO]) -> int:
         """
         批量创建或更新目录（upsert）
         
         存在则更新所有字段，不存在则创建。
         
         Args:
-            directory_dtos: DirectoryDTO 列表
+            directory_dtos: DirectoryDTO 可迭代对象（支持生成器，流式分批写入）
             
         Returns:
             int: 处理的记录数
         """
-        if not directory_dtos:
-            return 0
-        
         try:
             return self.repo.bulk_upsert(directory_dtos)
         except Exception as e:
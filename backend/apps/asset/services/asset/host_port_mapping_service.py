@@ -1,8 +1,12 @@
 """HostPortMapping Service - 业务逻辑层"""
 
+import hashlib
 import logging
+import time
 from typing import List, Iterator, Optional, Dict
 
+from django.contrib.postgres.aggregates import ArrayAgg
+from django.core.cache import cache
 from django.db.models import Min
 
 from apps.asset.repositories.asset import DjangoHostPortMappingRepository
@@ -11,6 +15,26 @@ from apps.common.utils.filter_utils import apply_filters
 
 logger = logging.getLogger(__name__)
 
+# IP 聚合结果缓存
+# - 结果 key 包含目标的版本号，写入/删除时更新版本号即可使该目标的所有缓存失效
+IP_AGGREGATION_CACHE_TTL = 300
+# 版本号 key 的过期时间需长于结果缓存，确保版本号过期回落为 0 时旧版本结果已全部过期
+IP_AGGREGATION_VERSION_TTL = IP_AGGREGATION_CACHE_TTL * 2
+_IP_AGG_VERSION_KEY = 'hpm:agg:ver:{target_id}'
+_IP_AGG_RESULT_KEY = 'hpm:agg:{target_id}:{version}:{filter_hash}'
+
+
+def invalidate_ip_aggregation_cache(target_id: int) -> None:
+    """使目标的 IP 聚合缓存失效（尽力而为，缓存不可用时只记录日志）"""
+    try:
+        cache.set(
+            _IP_AGG_VERSION_KEY.format(target_id=target_id),
+            time.time_ns(),
+            timeout=IP_AGGREGATION_VERSION_TTL
+        )
+    except Exception as e:
+        logger.warning("IP 聚合缓存失效失败 - Target ID: %s, 错误: %s", target_id, e)
+
 
 class HostPortMappingService:
     """主机端口映射服务 - 负责主机端口映射数据的业务逻辑
@@ -48,6 +72,10 @@ class HostPortMappingService:
             
             created_count = self.repo.bulk_create_ignore_conflicts(items)
             
+            if created_count:
+                for target_id in {item.target_id for item in items}:
+                    invalidate_ip_aggregation_cache(target_id)
+            
             logger.info("Service: 主机端口映射创建成功 - 数量: %d", created_count)
             
             return created_count
@@ -78,6 +106,12 @@ class HostPortMappingService:
         Returns:
             聚合后的 IP 数据列表
         """
+        cache_key = self._ip_aggregation_cache_key(target_id, filter_query)
+        if cache_key:
+            cached = cache.get(cache_key)
+            if cached is not None:
+                return cached
+        
         # 从 Repository 获取基础 QuerySet
         qs = self.repo.get_queryset_by_target(target_id)
         
@@ -86,7 +120,24 @@ class HostPortMappingService:
             qs = apply_filters(qs, filter_query, self.FILTER_FIELD_MAPPING)
         
         # Service 层处理聚合逻辑
-        return self._aggregate_by_ip(qs, filter_query, target_id=target_id)
+        results = self._aggregate_by_ip(qs, filter_query, target_id=target_id)
+        
+        if cache_key:
+            cache.set(cache_key, results, IP_AGGREGATION_CACHE_TTL)
+        return results
+
+    @staticmethod
+    def _ip_aggregation_cache_key(target_id: int, filter_query: Optional[str]) -> Optional[str]:
+        """生成 IP 聚合缓存 key，缓存不可用时返回 None（直接查库）"""
+        try:
+            version = cache.get(_IP_AGG_VERSION_KEY.format(target_id=target_id), 0)
+        except Exception as e:
+            logger.warning("读取 IP 聚合缓存失败，直接查询数据库: %s", e)
+            return None
+        filter_hash = hashlib.md5((filter_query or '').encode()).hexdigest()
+        return _IP_AGG_RESULT_KEY.format(
+            target_id=target_id, version=version, filter_hash=filter_hash
+        )
 
     def get_all_ip_aggregation(self, filter_query: Optional[str] = None) -> List[Dict]:
         """获取所有 IP 聚合数据（全局查询）
@@ -115,10 +166,13 @@ class HostPortMappingService:
     ) -> List[Dict]:
         """按 IP 聚合数据
         
+        单条 GROUP BY 查询完成聚合，hosts/ports 由 PostgreSQL array_agg 去重排序，
+        避免逐 IP 子查询（N+1）。
+        
         Args:
             qs: 已过滤的 QuerySet
-            filter_query: 过滤条件（用于子查询）
-            target_id: 目标 ID（用于子查询限定范围）
+            filter_query: 过滤条件（过滤已作用于 qs）
+            target_id: 目标 ID（范围已作用于 qs）
         
         Returns:
             聚合后的数据列表
@@ -126,31 +180,23 @@ class HostPortMappingService:
         ip_aggregated = (
             qs
             .values('ip')
-            .annotate(created_at=Min('created_at'))
+            .annotate(
+                created_at=Min('created_at'),
+                hosts=ArrayAgg('host', distinct=True, ordering='host'),
+                ports=ArrayAgg('port', distinct=True, ordering='port'),
+            )
             .order_by('-created_at')
         )
 
-        results = []
-        for item in ip_aggregated:
-            ip = item['ip']
-            
-            # 获取该 IP 的所有 host 和 port（也需要应用过滤条件）
-            mappings_qs = self.repo.get_queryset_by_ip(ip, target_id=target_id)
-            if filter_query:
-                mappings_qs = apply_filters(mappings_qs, filter_query, self.FILTER_FIELD_MAPPING)
-            
-            mappings = mappings_qs.values('host', 'port').distinct()
-            hosts = sorted({m['host'] for m in mappings})
-            ports = sorted({m['port'] for m in mappings})
-            
-            results.append({
-                'ip': ip,
-                'hosts': hosts,
-                'ports': ports,
+        return [
+            {
+                'ip': item['ip'],
+                'hosts': item['hosts'],
+                'ports': item['ports'],
                 'created_at': item['created_at'],
-            })
-        
-        return results
+            }
+            for item in ip_aggregated
+        ]
 
     def iter_ips_by_target(self, target_id: int, batch_size: int = 1000) -> Iterator[str]:
         """流式获取目标下的所有唯一 IP 地址。"""
@@ -98,6 +98,20 @@ class SubdomainService:
         logger.debug("批量查询子域名 - 数量: %d, Target ID: %d", len(names), target_id)
         return self.repo.get_by_names_and_target_id(names, target_id)
     
+    def get_id_map_by_names_and_target_id(self, names: set, target_id: int) -> dict:
+        """
+        根据域名列表和目标ID批量查询子域名 ID（不实例化 Model）
+        
+        Args:
+            names: 域名集合
+            target_id: 目标 ID
+        
+        Returns:
+            dict: {域名: 子域名 ID}
+        """
+        logger.debug("批量查询子域名 ID - 数量: %d, Target ID: %d", len(names), target_id)
+        return self.repo.get_id_map_by_names_and_target_id(names, target_id)
+    
     def get_subdomain_names_by_target(self, target_id: int) -> List[str]:
         """
         获取目标下的所有子域名名称
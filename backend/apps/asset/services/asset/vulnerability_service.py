@@ -1,16 +1,22 @@
 """Vulnerability Service - 漏洞资产业务逻辑层"""
 
 import logging
+from operator import attrgetter
 from typing import List, Optional
 
 from apps.asset.models import Vulnerability
 from apps.asset.dtos.asset import VulnerabilityDTO
 from apps.common.decorators import auto_ensure_db_connection
-from apps.common.utils import deduplicate_for_bulk
+from apps.common.utils import deduplicate_for_bulk, values_insert_ignore_conflicts
 from apps.common.utils.filter_utils import apply_filters
 
 logger = logging.getLogger(__name__)
 
+_VULNERABILITY_FIELDS = (
+    'target_id', 'url', 'vuln_type', 'severity', 'source',
+    'cvss_score', 'description', 'raw_output',
+)
+
 
 @auto_ensure_db_connection
 class VulnerabilityService:
@@ -44,22 +50,13 @@ class VulnerabilityService:
             # 根据模型唯一约束自动去重（如果模型没有唯一约束则跳过）
             unique_items = deduplicate_for_bulk(items, Vulnerability)
             
-            vulns = [
-                Vulnerability(
-                    target_id=item.target_id,
-                    url=item.url,
-                    vuln_type=item.vuln_type,
-                    severity=item.severity,
-                    source=item.source,
-                    cvss_score=item.cvss_score,
-                    description=item.description,
-                    raw_output=item.raw_output,
-                )
-                for item in unique_items
-            ]
-
-            Vulnerability.objects.bulk_create(vulns, ignore_conflicts=True)
-            logger.info("漏洞资产保存成功 - 数量: %d", len(vulns))
+            # execute_values 分页写入（raw_output 为 JSON，不适合 COPY / unnest）
+            created_count = values_insert_ignore_conflicts(
+                Vulnerability,
+                _VULNERABILITY_FIELDS,
+                map(attrgetter(*_VULNERABILITY_FIELDS), unique_items),
+            )
+            logger.info("漏洞资产保存成功 - 数量: %d", created_count)
 
         except Exception as e:
             logger.error(
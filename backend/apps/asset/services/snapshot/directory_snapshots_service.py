@@ -3,25 +3,30 @@
 import logging
 from typing import List, Iterator
 
+from django.db import transaction
+
 from apps.asset.repositories.snapshot import DjangoDirectorySnapshotRepository
 from apps.asset.services.asset import DirectoryService
 from apps.asset.dtos.snapshot import DirectorySnapshotDTO
 
 logger = logging.getLogger(__name__)
 
+# Repository 无状态，模块级共享一个实例，避免每次构造 Service 时重复创建
+_DIRECTORY_SNAPSHOT_REPO = DjangoDirectorySnapshotRepository()
+
 
 class DirectorySnapshotsService:
     """目录快照服务 - 统一管理快照和资产同步"""
     
-    def __init__(self):
-        self.snapshot_repo = DjangoDirectorySnapshotRepository()
-        self.asset_service = DirectoryService()
+    def __init__(self, snapshot_repo=None, asset_service=None):
+        self.snapshot_repo = snapshot_repo or _DIRECTORY_SNAPSHOT_REPO
+        self.asset_service = asset_service or DirectoryService()
     
     def save_and_sync(self, items: List[DirectorySnapshotDTO]) -> None:
         """
         保存目录快照并同步到资产表（统一入口）
         
-        流程：
+        流程（同一事务内完成）：
         1. 保存到快照表（完整记录，包含 scan_id）
         2. 同步到资产表（去重，不包含 scan_id）
         
@@ -34,27 +39,30 @@ class DirectorySnapshotsService:
         if not items:
             return
         
-        # 检查 Scan 是否仍存在（防止删除后竞态写入）
-        scan_id = items[0].scan_id
-        from apps.scan.repositories import DjangoScanRepository
-        if not DjangoScanRepository().exists(scan_id):
-            logger.warning("Scan 已删除，跳过目录快照保存 - scan_id=%s, 数量=%d", scan_id, len(items))
-            return
-        
         try:
             logger.debug("保存目录快照并同步到资产表 - 数量: %d", len(items))
             
-            # 步骤 1: 保存到快照表
-            logger.debug("步骤 1: 保存到快照表")
-            self.snapshot_repo.save_snapshots(items)
-            
-            # 步骤 2: 转换为资产 DTO 并保存到资产表（upsert）
-            # - 新记录：插入资产表
-            # - 已存在的记录：更新字段（created_at 不更新，保留创建时间）
-            logger.debug("步骤 2: 同步到资产表（通过 Service 层，upsert）")
-            asset_items = [item.to_asset_dto() for item in items]
-            
-            self.asset_service.bulk_upsert(asset_items)
+            # 快照写入与资产同步在同一事务内提交（只 COMMIT 一次）
+            with transaction.atomic():
+                # 步骤 1: 保存到快照表
+                # 同一条 SQL 内检查 Scan 是否仍存在（防止删除后竞态写入）
+                logger.debug("步骤 1: 保存到快照表")
+                live_scan_ids = self.snapshot_repo.save_snapshots(items)
+                if not live_scan_ids:
+                    logger.warning(
+                        "Scan 已删除，跳过目录快照保存 - scan_id=%s, 数量=%d",
+                        items[0].scan_id, len(items)
+                    )
+                    return
+                if len(live_scan_ids) < len({item.scan_id for item in items}):
+                    items = [item for item in items if item.scan_id in live_scan_ids]
+                
+                # 步骤 2: 转换为资产 DTO 并保存到资产表（upsert）
+                # - 新记录：插入资产表
+                # - 已存在的记录：更新字段（created_at 不更新，保留创建时间）
+                logger.debug("步骤 2: 同步到资产表（通过 Service 层，upsert）")
+                # 生成器流式转换，避免额外分配一份完整的 DTO 列表
+                self.asset_service.bulk_upsert(item.to_asset_dto() for item in items)
             
             logger.info("目录快照和资产数据保存成功 - 数量: %d", len(items))
             
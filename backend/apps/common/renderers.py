@@ -0,0 +1,25 @@
+"""
+自定义渲染器
+"""
+from rest_framework.renderers import BaseRenderer
+
+
+class PlainTextRenderer(BaseRenderer):
+    """
+    纯文本渲染器
+    
+    用于让 Accept: text/plain（或 ?format=txt）通过内容协商；
+    视图通常直接返回 StreamingHttpResponse，此处仅兜底渲染错误响应等数据。
+    """
+    media_type = 'text/plain'
+    format = 'txt'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if isinstance(data, bytes):
+            return data
+        if isinstance(data, dict) and 'error' in data:
+            data = data['error']
+        return str(data).encode(self.charset)
@@ -3,15 +3,207 @@
 
 提供系统日志的读取功能，支持：
 - 从日志目录读取日志文件
+- 当前文件行数不足时从轮转备份（xingrin.log.1 ...）补足
+- 折叠连续重复的日志行（忽略时间戳）
 - 限制返回行数，防止内存溢出
+- 开启 LOG_REDIS_RING 时优先从 Redis 环形缓冲读取，Redis 不可用时回退到文件
 """
 
 import logging
-import subprocess
+import os
+from contextlib import closing
+from functools import lru_cache
+from itertools import groupby, islice
+from typing import Iterator
+
+import redis
+from django.conf import settings
+
+from config.logging_config import REDIS_LOG_RING_KEY
 
 
 logger = logging.getLogger(__name__)
 
+_ring_client: redis.Redis | None = None
+
+# 反向读取块大小
+_TAIL_BLOCK_SIZE = 64 * 1024
+
+# 流式响应分块大小
+_STREAM_CHUNK_SIZE = 64 * 1024
+
+
+def _iter_lines_reversed(path: str, end: int | None = None) -> Iterator[bytes]:
+    """
+    从文件末尾反向按块读取，逐行产出（从新到旧，不含换行符）
+    
+    惰性读取：调用方停止迭代后不再读取更早的块，不创建子进程，
+    也不构建整段行列表。
+    
+    Args:
+        path: 文件路径
+        end: 视为文件末尾的字节偏移，默认为当前文件大小
+    
+    Yields:
+        bytes: 日志行，从最后一行开始
+    """
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        offset = os.fstat(fd).st_size if end is None else end
+        if offset == 0:
+            return
+        carry = b""
+        # 末尾换行不算作新的一行（与 tail 行为一致）
+        skip_trailing_newline = True
+        while offset > 0:
+            read_size = min(_TAIL_BLOCK_SIZE, offset)
+            offset -= read_size
+            block = os.pread(fd, read_size, offset) + carry
+            if skip_trailing_newline and block.endswith(b"\n"):
+                block = block[:-1]
+            skip_trailing_newline = False
+            parts = block.split(b"\n")
+            # 第一段可能不完整，留到下一轮与前面的块拼接
+            carry = parts[0]
+            yield from reversed(parts[1:])
+        # 读到文件开头时，剩余部分就是第一行（可能为空行）
+        yield carry
+    finally:
+        os.close(fd)
+
+
+def _take_last(lines_reversed: Iterator[bytes], n: int) -> list[bytes]:
+    """从反向行迭代器中取 n 行，恢复为文件中的顺序"""
+    with closing(lines_reversed):
+        lines = list(islice(lines_reversed, n))
+    lines.reverse()
+    return lines
+
+
+def _tail_file(path: str, n: int, end: int | None = None) -> list[bytes]:
+    """
+    返回文件最后 n 行（不含换行符），保持文件中的顺序
+    
+    Args:
+        path: 文件路径
+        n: 行数
+        end: 视为文件末尾的字节偏移，默认为当前文件大小
+    """
+    return _take_last(_iter_lines_reversed(path, end), n)
+
+
+def _iter_files_reversed(paths: tuple[str, ...]) -> Iterator[bytes]:
+    """依次反向读取多个文件，遇到不存在的文件即停止（备份按序号连续生成）"""
+    for path in paths:
+        lines = _iter_lines_reversed(path)
+        try:
+            with closing(lines):
+                yield from lines
+        except FileNotFoundError:
+            return
+
+
+def _tail_files(paths: tuple[str, ...], n: int) -> list[bytes]:
+    """
+    跨轮转文件读取最后 n 行
+    
+    RotatingFileHandler 的每个文件内部已按时间有序，且 xingrin.log.1
+    整体早于 xingrin.log，因此从新到旧连续反向读取、取够 n 行后
+    倒序即可，无需解析时间戳排序。
+    
+    Args:
+        paths: 候选日志文件路径，从新到旧排列（xingrin.log, xingrin.log.1, ...）
+        n: 行数
+    """
+    return _take_last(_iter_files_reversed(paths), n)
+
+
+def _join_lines(lines: list[bytes]) -> str:
+    """将原始行拼接并解码为文本，每行以换行符结尾"""
+    if not lines:
+        return ""
+    return b"\n".join(lines).decode("utf-8", "replace") + "\n"
+
+
+def _strip_timestamp(line: bytes) -> bytes:
+    """去掉行首 "[YYYY-MM-DD HH:MM:SS] " 时间戳，用于判断重复行"""
+    if line.startswith(b"["):
+        end = line.find(b"] ")
+        if end != -1:
+            return line[end + 2:]
+    return line
+
+
+def _dedupe_consecutive(lines: list[bytes]) -> list[bytes]:
+    """
+    折叠连续重复的日志行（忽略时间戳）
+    
+    每组保留第一行，重复多次时追加 " [repeated N×]" 标记。
+    """
+    result: list[bytes] = []
+    for _, group in groupby(lines, key=_strip_timestamp):
+        first = next(group)
+        count = 1 + sum(1 for _ in group)
+        result.append(first if count == 1 else first + f" [repeated {count}×]".encode())
+    return result
+
+
+@lru_cache(maxsize=32)
+def _cached_tail_content(
+    paths: tuple[str, ...], file_key: tuple, lines: int, dedupe: bool = False
+) -> str:
+    """
+    读取日志末尾内容并缓存
+    
+    file_key 为当前日志文件的 (inode, mtime_ns, size)，追加写入后即变化；
+    备份文件只在轮转时变化，而轮转必然改变当前文件的 inode，
+    因此无需逐个 stat 备份文件。前端轮询期间日志未变化时直接命中缓存，
+    命中路径只有一次 stat。
+    缓存拼接后的字符串而非中间行列表，控制内存占用。
+    """
+    tail_lines = _tail_files(paths, lines)
+    if dedupe:
+        tail_lines = _dedupe_consecutive(tail_lines)
+    return _join_lines(tail_lines)
+
+
+def _iter_chunks(lines: list[bytes]) -> Iterator[bytes]:
+    """将原始行按约 _STREAM_CHUNK_SIZE 字节分块输出，每行以换行符结尾"""
+    buf: list[bytes] = []
+    size = 0
+    for line in lines:
+        buf.append(line)
+        size += len(line) + 1
+        if size >= _STREAM_CHUNK_SIZE:
+            yield b"\n".join(buf) + b"\n"
+            buf = []
+            size = 0
+    if buf:
+        yield b"\n".join(buf) + b"\n"
+
+
+def _get_ring_client() -> redis.Redis:
+    """懒加载 Redis 连接（进程内复用）"""
+    global _ring_client
+    if _ring_client is None:
+        _ring_client = redis.Redis(
+            host=settings.REDIS_HOST,
+            port=settings.REDIS_PORT,
+            db=settings.REDIS_DB,
+            socket_timeout=1,
+            socket_connect_timeout=1,
+        )
+    return _ring_client
+
+
+def _parse_cursor(cursor: str | None) -> tuple[int | None, int]:
+    """解析增量游标 "<inode>:<offset>"，非法游标视为无游标"""
+    try:
+        inode, offset = cursor.split(":", 1)
+        return int(inode), int(offset)
+    except (AttributeError, ValueError):
+        return None, 0
+
 
 class SystemLogService:
     """
@@ -25,45 +217,141 @@ class SystemLogService:
         self.log_file = "/app/backend/logs/xingrin.log"
         self.default_lines = 200        # 默认返回行数
         self.max_lines = 10000          # 最大返回行数限制
-        self.timeout_seconds = 3        # tail 命令超时时间
+        self.backup_count = 5           # 轮转备份数（与 logging_config 中 backupCount 一致）
+        self.max_delta_bytes = 4 * 1024 * 1024  # 增量读取上限，超出则退回尾部窗口
 
-    def get_logs_content(self, lines: int | None = None) -> str:
+    def get_logs_content(self, lines: int | None = None, dedupe: bool = True) -> str:
         """
         获取系统日志内容
         
         Args:
             lines: 返回的日志行数，默认 200 行，最大 10000 行
+            dedupe: 是否折叠连续重复行（在读取的 lines 行内折叠）
             
         Returns:
             str: 日志内容，每行以换行符分隔，保持原始顺序
         """
-        # 参数校验和默认值处理
-        if lines is None:
-            lines = self.default_lines
-
-        lines = int(lines)
-        if lines < 1:
-            lines = 1
-        if lines > self.max_lines:
-            lines = self.max_lines
-
-        # 使用 tail 命令读取日志文件末尾内容
-        cmd = ["tail", "-n", str(lines), self.log_file]
-
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=self.timeout_seconds,
-            check=False,
-        )
+        lines = self._normalize_lines(lines)
 
-        if result.returncode != 0:
-            logger.warning(
-                "tail command failed: returncode=%s stderr=%s",
-                result.returncode,
-                (result.stderr or "").strip(),
-            )
+        ring_lines = self._read_ring(lines)
+        if ring_lines is not None:
+            if dedupe:
+                ring_lines = _dedupe_consecutive(ring_lines)
+            return _join_lines(ring_lines)
 
+        # 进程内从文件末尾反向读取，避免 fork/exec tail；
+        # 当前文件行数不足时（刚轮转）继续从备份文件补足；
+        # 按文件状态缓存，日志未变化时不重复读取
         # 直接返回原始内容，保持文件中的顺序
-        return result.stdout or ""
+        try:
+            st = os.stat(self.log_file)
+        except FileNotFoundError:
+            return ""
+        except OSError as e:
+            logger.warning("读取日志文件失败: path=%s error=%s", self.log_file, e)
+            return ""
+
+        try:
+            file_key = (st.st_ino, st.st_mtime_ns, st.st_size)
+            return _cached_tail_content(self._log_paths(), file_key, lines, dedupe)
+        except OSError as e:
+            logger.warning("读取日志文件失败: path=%s error=%s", self.log_file, e)
+            return ""
+
+    def get_logs_iter(self, lines: int | None = None, dedupe: bool = True) -> Iterator[bytes]:
+        """
+        以分块方式获取系统日志内容（用于流式响应）
+        
+        不拼接完整字符串，也不经过缓存；文件在调用时即读取，
+        读取失败不会在流式输出中途抛出。
+        
+        Args:
+            lines: 返回的日志行数，默认 200 行，最大 10000 行
+            dedupe: 是否折叠连续重复行
+            
+        Returns:
+            Iterator[bytes]: 原始日志字节块，保持文件中的顺序
+        """
+        lines = self._normalize_lines(lines)
+        tail_lines = self._read_ring(lines)
+        if tail_lines is None:
+            try:
+                tail_lines = _tail_files(self._log_paths(), lines)
+            except OSError as e:
+                logger.warning("读取日志文件失败: path=%s error=%s", self.log_file, e)
+                tail_lines = []
+        if dedupe:
+            tail_lines = _dedupe_consecutive(tail_lines)
+        return _iter_chunks(tail_lines)
+
+    def get_logs_delta(self, cursor: str | None = None) -> tuple[str, str]:
+        """
+        增量获取日志：只返回游标之后新追加的完整行
+        
+        游标格式为 "<inode>:<offset>"。无游标、文件已轮转/截断或积压超过
+        max_delta_bytes 时，退回返回默认行数的尾部窗口并重置游标。
+        
+        Args:
+            cursor: 上次调用返回的游标
+            
+        Returns:
+            (日志内容, 新游标)
+        """
+        try:
+            fd = os.open(self.log_file, os.O_RDONLY)
+        except OSError as e:
+            logger.warning("读取日志文件失败: path=%s error=%s", self.log_file, e)
+            return "", cursor or ""
+
+        try:
+            st = os.fstat(fd)
+            inode, offset = _parse_cursor(cursor)
+
+            if (
+                inode != st.st_ino
+                or offset > st.st_size
+                or st.st_size - offset > self.max_delta_bytes
+            ):
+                tail_lines = _tail_file(self.log_file, self.default_lines, end=st.st_size)
+                return _join_lines(tail_lines), f"{st.st_ino}:{st.st_size}"
+
+            data = os.pread(fd, st.st_size - offset, offset)
+            # 只返回完整行，未写完的行留到下次
+            complete = data[:data.rfind(b"\n") + 1]
+            return complete.decode("utf-8", "replace"), f"{st.st_ino}:{offset + len(complete)}"
+        finally:
+            os.close(fd)
+
+    def _read_ring(self, lines: int) -> list[bytes] | None:
+        """
+        从 Redis 环形缓冲读取最近 lines 条日志（按记录计）
+        
+        Returns:
+            list[bytes]: 保持时间顺序的日志；未开启、缓冲为空或 Redis 不可用时
+                返回 None（调用方回退到文件）
+        """
+        if not getattr(settings, 'LOG_REDIS_RING', False):
+            return None
+        try:
+            # LPUSH 写入，最新记录在前
+            records = _get_ring_client().lrange(REDIS_LOG_RING_KEY, 0, lines - 1)
+        except redis.RedisError as e:
+            logger.warning("读取 Redis 日志缓冲失败，回退到日志文件: %s", e)
+            return None
+        if not records:
+            # 缓冲为空（刚开启或 Redis 重启），回退到文件
+            return None
+        records.reverse()
+        return records
+
+    def _normalize_lines(self, lines: int | None) -> int:
+        """参数校验和默认值处理，限制在 [1, max_lines]"""
+        if lines is None:
+            return self.default_lines
+        return max(1, min(int(lines), self.max_lines))
+
+    def _log_paths(self) -> tuple[str, ...]:
+        """当前日志及轮转备份的候选路径（从新到旧），不访问文件系统"""
+        return (self.log_file,) + tuple(
+            f"{self.log_file}.{i}" for i in range(1, self.backup_count + 1)
+        )
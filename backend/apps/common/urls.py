@@ -7,7 +7,7 @@
 """
 
 from django.urls import path
-from .views import LoginView, LogoutView, MeView, ChangePasswordView, SystemLogsView
+from .views import LoginView, LogoutView, MeView, ChangePasswordView, SystemLogsView, SystemLogsDeltaView
 
 urlpatterns = [
     # 认证相关
@@ -18,4 +18,5 @@ urlpatterns = [
     
     # 系统管理
     path('system/logs/', SystemLogsView.as_view(), name='system-logs'),
+    path('system/logs/stream/', SystemLogsDeltaView.as_view(), name='system-logs-stream'),
 ]
@@ -13,6 +13,8 @@ from .csv_utils import (
     format_datetime,
     UTF8_BOM,
 )
+from .model_factory import model_factory
+from .pg_bulk import copy_insert_ignore_conflicts, values_insert_ignore_conflicts
 
 __all__ = [
     'deduplicate_for_bulk',
@@ -25,4 +27,7 @@ __all__ = [
     'format_list_field',
     'format_datetime',
     'UTF8_BOM',
+    'model_factory',
+    'copy_insert_ignore_conflicts',
+    'values_insert_ignore_conflicts',
 ]
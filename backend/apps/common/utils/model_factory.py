@@ -0,0 +1,49 @@
+"""DTO → Model 工厂函数生成工具
+
+批量写入时需要把大量 DTO 转换为 Model。在导入期为每个 (Model, 字段列表)
+生成一次专用函数：
+
+    def make(item):
+        return Model(target_id=item.target_id, url=item.url, ...)
+
+字段列表在生成时就固定为常量代码，循环中只剩属性读取和一次构造调用，
+比每次迭代重新拼装关键字参数的推导式更快。
+"""
+
+from functools import lru_cache
+from typing import Callable, Sequence
+
+from django.db import models
+
+
+@lru_cache(maxsize=None)
+def _build_factory(model: type[models.Model], fields: tuple[str, ...]) -> Callable:
+    for name in fields:
+        if not name.isidentifier():
+            raise ValueError(f"非法字段名: {name!r}")
+        # 校验字段存在（get_field 同时支持外键 attname，如 target_id）
+        model._meta.get_field(name)
+
+    kwargs = ', '.join(f'{name}=item.{name}' for name in fields)
+    source = f'def make(item):\n    return Model({kwargs})\n'
+    namespace = {'Model': model}
+    exec(compile(source, f'<model_factory:{model.__name__}>', 'exec'), namespace)  # noqa: S102
+    return namespace['make']
+
+
+def model_factory(model: type[models.Model], fields: Sequence[str]) -> Callable:
+    """
+    生成把 DTO 转换为 Model 实例的专用函数（按 Model + 字段缓存）
+
+    Args:
+        model: Django 模型类
+        fields: 字段名列表，DTO 与 Model 上同名（外键使用 xxx_id）
+
+    Returns:
+        Callable[[DTO], Model]
+
+    Example:
+        _make_directory = model_factory(Directory, ('target_id', 'url', 'status'))
+        directories = list(map(_make_directory, items))
+    """
+    return _build_factory(model, tuple(fields))
@@ -0,0 +1,154 @@
+"""PostgreSQL 批量写入工具
+
+- copy_insert_ignore_conflicts：COPY ... FROM STDIN 写入临时表，再用一条
+  INSERT ... SELECT ... ON CONFLICT (唯一约束列) DO NOTHING 合并到目标表。
+  适合大批量标量字段（不支持 ArrayField / JSONField）。
+- values_insert_ignore_conflicts：psycopg2 execute_values 分页写入，
+  适合包含 JSONField 等不便走 COPY / unnest 的表。
+
+两者都不实例化 Model，auto_now / auto_now_add 列由数据库 NOW() 填充。
+"""
+
+import csv
+import io
+import logging
+import uuid
+from typing import Iterable, Sequence
+
+from django.db import connection, models, transaction
+from psycopg2.extras import Json, execute_values
+
+logger = logging.getLogger(__name__)
+
+# execute_values 每页行数（单条 INSERT 的 VALUES 行数）
+DEFAULT_PAGE_SIZE = 500
+
+
+def _auto_now_columns(model: type[models.Model], columns: Sequence[str]) -> list[str]:
+    """返回未显式提供、需要由数据库填充 NOW() 的 auto_now / auto_now_add 列"""
+    return [
+        field.column
+        for field in model._meta.concrete_fields
+        if (getattr(field, 'auto_now_add', False) or getattr(field, 'auto_now', False))
+        and field.column not in columns
+    ]
+
+
+def copy_insert_ignore_conflicts(
+    model: type[models.Model],
+    fields: Sequence[str],
+    rows: Iterable[tuple],
+    conflict_fields: Sequence[str],
+) -> int:
+    """
+    使用 COPY + 临时表批量插入，冲突时跳过
+
+    只跳过违反 conflict_fields 对应唯一约束的行（与 bulk_create(ignore_conflicts=True)
+    针对模型 UniqueConstraint 去重的意图一致），违反其他约束时仍然报错。
+
+    Args:
+        model: Django 模型类（用于读取表名与列名）
+        fields: 字段 attname 列表（外键使用 xxx_id），顺序与 rows 中元组一致
+        rows: 数据行元组
+        conflict_fields: 冲突判定的唯一约束字段 attname 列表
+
+    Returns:
+        int: 实际插入的记录数
+
+    Example:
+        copy_insert_ignore_conflicts(
+            Subdomain, ('name', 'target_id'),
+            ((item.name, item.target_id) for item in items),
+            conflict_fields=('name', 'target_id'),
+        )
+    """
+    table = model._meta.db_table
+    columns = [model._meta.get_field(name).column for name in fields]
+    auto_now_columns = _auto_now_columns(model, columns)
+    conflict_sql = ', '.join(
+        f'"{model._meta.get_field(name).column}"' for name in conflict_fields
+    )
+    # 每次调用使用独立的临时表名：同一外层事务内多次调用时互不冲突
+    tmp_table = f'tmp_copy_{uuid.uuid4().hex}'
+
+    # QUOTE_NONNUMERIC：空字符串写成 ""，None 写成空字段（COPY CSV 视为 NULL）
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, quoting=csv.QUOTE_NONNUMERIC)
+    writer.writerows(rows)
+    buffer.seek(0)
+
+    column_sql = ', '.join(f'"{c}"' for c in columns)
+    insert_columns = column_sql + ''.join(f', "{c}"' for c in auto_now_columns)
+    select_columns = column_sql + ', NOW()' * len(auto_now_columns)
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            f'CREATE TEMP TABLE "{tmp_table}" ON COMMIT DROP AS '
+            f'SELECT {column_sql} FROM "{table}" WITH NO DATA'
+        )
+        cursor.copy_expert(
+            f'COPY "{tmp_table}" ({column_sql}) FROM STDIN WITH (FORMAT csv)',
+            buffer,
+        )
+        cursor.execute(
+            f'INSERT INTO "{table}" ({insert_columns}) '
+            f'SELECT {select_columns} FROM "{tmp_table}" '
+            f'ON CONFLICT ({conflict_sql}) DO NOTHING'
+        )
+        inserted = cursor.rowcount
+
+    logger.debug("COPY 写入 %s 完成 - 插入: %d", table, inserted)
+    return inserted
+
+
+def values_insert_ignore_conflicts(
+    model: type[models.Model],
+    fields: Sequence[str],
+    rows: Iterable[tuple],
+    page_size: int = DEFAULT_PAGE_SIZE,
+) -> int:
+    """
+    使用 psycopg2 execute_values 分页批量插入，冲突时跳过
+
+    JSONField 列的值会自动用 psycopg2 Json 适配。
+
+    Args:
+        model: Django 模型类（用于读取表名与列名）
+        fields: 字段 attname 列表（外键使用 xxx_id），顺序与 rows 中元组一致
+        rows: 数据行元组
+        page_size: 每条 INSERT 语句包含的行数
+
+    Returns:
+        int: 实际插入的记录数
+    """
+    table = model._meta.db_table
+    model_fields = [model._meta.get_field(name) for name in fields]
+    columns = [field.column for field in model_fields]
+    auto_now_columns = _auto_now_columns(model, columns)
+    json_positions = [
+        i for i, field in enumerate(model_fields) if isinstance(field, models.JSONField)
+    ]
+
+    if json_positions:
+        def adapt(row: tuple) -> tuple:
+            row = list(row)
+            for i in json_positions:
+                if row[i] is not None:
+                    row[i] = Json(row[i])
+            return tuple(row)
+        rows = map(adapt, rows)
+
+    insert_columns = ', '.join(f'"{c}"' for c in [*columns, *auto_now_columns])
+    template = '(' + ', '.join(['%s'] * len(columns) + ['NOW()'] * len(auto_now_columns)) + ')'
+    sql = (
+        f'INSERT INTO "{table}" ({insert_columns}) VALUES %s '
+        f'ON CONFLICT DO NOTHING RETURNING 1'
+    )
+
+    with connection.cursor() as cursor:
+        inserted = execute_values(
+            cursor.cursor, sql, rows, template=template, page_size=page_size, fetch=True
+        )
+
+    logger.debug("execute_values 写入 %s 完成 - 插入: %d", table, len(inserted))
+    return len(inserted)
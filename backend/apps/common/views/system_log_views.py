@@ -6,13 +6,16 @@
 
 import logging
 
+from django.http import StreamingHttpResponse
 from django.utils.decorators import method_decorator
 from django.views.decorators.csrf import csrf_exempt
 from rest_framework import status
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
 from rest_framework.views import APIView
 
+from apps.common.renderers import PlainTextRenderer
 from apps.common.services.system_log_service import SystemLogService
 
 
@@ -29,6 +32,7 @@ class SystemLogsView(APIView):
         
     Query Parameters:
         lines (int, optional): 返回的日志行数，默认 200，最大 10000
+        dedupe (bool, optional): 是否折叠连续重复行（忽略时间戳），默认 true
         
     Response:
         {
@@ -43,6 +47,7 @@ class SystemLogsView(APIView):
     # TODO: 生产环境应改为 IsAdminUser 权限
     authentication_classes = []
     permission_classes = [AllowAny]
+    renderer_classes = [*api_settings.DEFAULT_RENDERER_CLASSES, PlainTextRenderer]
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
@@ -58,12 +63,57 @@ class SystemLogsView(APIView):
             # 解析 lines 参数
             lines_raw = request.query_params.get("lines")
             lines = int(lines_raw) if lines_raw is not None else None
+            dedupe = request.query_params.get("dedupe", "true").lower() not in ("false", "0")
+
+            # 纯文本：分块流式输出
+            if isinstance(request.accepted_renderer, PlainTextRenderer):
+                return StreamingHttpResponse(
+                    self.service.get_logs_iter(lines=lines, dedupe=dedupe),
+                    content_type='text/plain; charset=utf-8'
+                )
 
             # 调用服务获取日志内容
-            content = self.service.get_logs_content(lines=lines)
+            content = self.service.get_logs_content(lines=lines, dedupe=dedupe)
             return Response({"content": content})
         except ValueError:
             return Response({"error": "lines 参数必须是整数"}, status=status.HTTP_400_BAD_REQUEST)
         except Exception:
             logger.exception("获取系统日志失败")
             return Response({"error": "获取系统日志失败"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class SystemLogsDeltaView(APIView):
+    """
+    系统日志增量 API 视图
+    
+    GET /api/system/logs/stream/
+        获取游标之后新追加的日志，用于前端轮询时只拉取增量
+        
+    Query Parameters:
+        since (str, optional): 上次返回的游标；为空时返回尾部窗口
+        
+    Response:
+        {
+            "content": "新增日志内容...",
+            "cursor": "下次请求携带的游标"
+        }
+    """
+    
+    # TODO: 生产环境应改为 IsAdminUser 权限
+    authentication_classes = []
+    permission_classes = [AllowAny]
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.service = SystemLogService()
+
+    def get(self, request):
+        """获取增量日志"""
+        try:
+            since = request.query_params.get("since") or None
+            content, cursor = self.service.get_logs_delta(cursor=since)
+            return Response({"content": content, "cursor": cursor})
+        except Exception:
+            logger.exception("获取增量系统日志失败")
+            return Response({"error": "获取系统日志失败"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -8,7 +8,10 @@ class EngineConfig(AppConfig):
     verbose_name = '扫描引擎'
     
     def ready(self):
-        """应用就绪时启动定时调度器"""
+        """应用就绪时注册信号接收器并启动定时调度器"""
+        # 注册信号接收器
+        from . import receivers  # noqa: F401
+        
         # 只在主进程中启动调度器（避免 autoreload 重复启动）
         # 检查是否在 runserver 的 autoreload 子进程中
         if os.environ.get('RUN_MAIN') == 'true' or not self._is_runserver():
@@ -54,7 +54,12 @@ class WorkerNode(models.Model):
                 name='unique_worker_name'
             ),
         ]
-    
+        indexes = [
+            # 调度按状态筛选可用节点（status__in=['online', 'offline']），
+            # 前缀 status 同时覆盖单独按状态的查询
+            models.Index(fields=['status', 'is_local']),
+        ]
+
     def __str__(self):
         if self.is_local:
             return f"{self.name} (本地)"
@@ -66,7 +71,8 @@ class ScanEngine(models.Model):
     
     id = models.AutoField(primary_key=True)
     name = models.CharField(max_length=200, unique=True, help_text='引擎名称')
-    configuration = models.CharField(max_length=10000, blank=True, default='', help_text='引擎配置，yaml 格式')
+    # TextField：大段 YAML 由 PostgreSQL TOAST 行外存储，不膨胀主表行
+    configuration = models.TextField(blank=True, default='', help_text='引擎配置，yaml 格式')
     created_at = models.DateTimeField(auto_now_add=True, help_text='创建时间')
     updated_at = models.DateTimeField(auto_now=True, help_text='更新时间')
 
@@ -0,0 +1,18 @@
+"""引擎模块信号接收器
+
+WorkerNode 保存/删除时使任务分发器的已部署节点缓存失效。
+QuerySet.update() 不会触发模型信号，此类变更依赖缓存 TTL 过期。
+"""
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.engine.models import WorkerNode
+from apps.engine.services.task_distributor import TaskDistributor
+
+
+@receiver(post_save, sender=WorkerNode)
+@receiver(post_delete, sender=WorkerNode)
+def on_worker_node_changed(sender, instance, **kwargs):
+    """WorkerNode 变更后使已部署节点缓存失效"""
+    TaskDistributor.invalidate_workers_cache()
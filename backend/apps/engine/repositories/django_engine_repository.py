@@ -35,6 +35,18 @@ class DjangoEngineRepository:
         except ScanEngine.DoesNotExist:  # type: ignore
             logger.warning("ScanEngine 不存在 - Engine ID: %s", engine_id)
             return None
+    
+    def exists(self, engine_id: int) -> bool:
+        """
+        检查扫描引擎是否存在（不读取 configuration）
+        
+        Args:
+            engine_id: 引擎 ID
+        
+        Returns:
+            是否存在
+        """
+        return ScanEngine.objects.filter(id=engine_id).exists()  # type: ignore
 
 
 __all__ = ['DjangoEngineRepository']
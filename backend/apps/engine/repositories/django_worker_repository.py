@@ -27,6 +27,15 @@ class DjangoWorkerRepository:
             logger.warning("WorkerNode 不存在 - ID: %s", worker_id)
             return None
 
+    def get_for_heartbeat(self, worker_id: int) -> WorkerNode | None:
+        """按 ID 获取心跳处理所需字段（状态判断 + 远程更新所需的 SSH 信息）"""
+        return (
+            WorkerNode.objects
+            .only('id', 'name', 'status', 'is_local', 'ip_address', 'ssh_port', 'username', 'password')
+            .filter(id=worker_id)
+            .first()
+        )
+
     def get_all(self):
         """获取所有 Worker 节点的查询集"""
         return WorkerNode.objects.all().order_by("-created_at")
@@ -42,6 +51,17 @@ class DjangoWorkerRepository:
         logger.info("Worker %s 状态更新为: %s", worker_id, status)
         return True
 
+    def compare_and_set_status(self, worker_id: int, expected: str, status: str) -> bool:
+        """仅当当前状态为 expected 时更新状态（单条 UPDATE，无需先查询）
+
+        Returns:
+            是否实际更新（状态已被其他流程修改时返回 False）
+        """
+        updated = WorkerNode.objects.filter(id=worker_id, status=expected).update(status=status)
+        if updated:
+            logger.info("Worker %s 状态更新为: %s", worker_id, status)
+        return updated > 0
+
 
     def delete_by_id(self, worker_id: int) -> bool:
         """根据 ID 删除 Worker 节点"""
@@ -145,20 +145,14 @@ class TemplateFileRepository:
 
         return [root_node]
 
-    def get_file_content(self, rel_path: str) -> Optional[Dict]:
-        """根据相对路径获取模板文件内容
+    def resolve_file(self, rel_path: str) -> Optional[Path]:
+        """将相对路径解析为 root 内的模板文件绝对路径
 
         Args:
             rel_path: 相对于 root 的路径，如 "http/cves/CVE-2021-1234.yaml"
 
         Returns:
-            成功时返回：
-            {
-                "path": "http/cves/CVE-2021-1234.yaml",
-                "name": "CVE-2021-1234.yaml",
-                "content": "id: CVE-2021-1234\ninfo:\n  name: ..."
-            }
-            失败时返回 None（路径无效、文件不存在、读取失败等）
+            文件绝对路径；路径无效、越出 root 或文件不存在时返回 None
         """
         # 清理路径
         rel_path = (rel_path or "").strip().lstrip("/")
@@ -180,6 +174,27 @@ class TemplateFileRepository:
         if not target_path.is_file():
             return None
 
+        return target_path
+
+    def get_file_content(self, rel_path: str) -> Optional[Dict]:
+        """根据相对路径获取模板文件内容
+
+        Args:
+            rel_path: 相对于 root 的路径，如 "http/cves/CVE-2021-1234.yaml"
+
+        Returns:
+            成功时返回：
+            {
+                "path": "http/cves/CVE-2021-1234.yaml",
+                "name": "CVE-2021-1234.yaml",
+                "content": "id: CVE-2021-1234\ninfo:\n  name: ..."
+            }
+            失败时返回 None（路径无效、文件不存在、读取失败等）
+        """
+        target_path = self.resolve_file(rel_path)
+        if target_path is None:
+            return None
+
         # 读取文件内容
         try:
             content = target_path.read_text(encoding="utf-8", errors="replace")
@@ -187,7 +202,7 @@ class TemplateFileRepository:
             return None
 
         return {
-            "path": rel_path,
+            "path": (rel_path or "").strip().lstrip("/"),
             "name": target_path.name,
             "content": content,
         }
@@ -13,15 +13,21 @@
 - 扫描任务由主服务器通过 SSH docker run 执行
 """
 
+import re
+from functools import lru_cache
 from pathlib import Path
 from django.conf import settings
 
 # 脚本目录
 SCRIPTS_DIR = Path(__file__).parent.parent.parent.parent / "scripts" / "worker-deploy"
 
+# 脚本占位符：{{NAME}}（不会匹配 docker --format '{{.Names}}'）
+_PLACEHOLDER_RE = re.compile(r"\{\{([A-Z_]+)\}\}")
 
+
+@lru_cache(maxsize=None)
 def _read_script(filename: str) -> str:
-    """读取脚本文件内容"""
+    """读取脚本文件内容（脚本随镜像发布，运行期不变，首次读取后缓存）"""
     script_path = SCRIPTS_DIR / filename
     if script_path.exists():
         return script_path.read_text()
@@ -29,21 +35,33 @@ def _read_script(filename: str) -> str:
         raise FileNotFoundError(f"脚本文件不存在: {script_path}")
 
 
+def _render_script(filename: str, **values: str) -> str:
+    """
+    单次扫描替换脚本中的 {{NAME}} 占位符
+    
+    未提供值的占位符保持原样。
+    """
+    script = _read_script(filename)
+    return _PLACEHOLDER_RE.sub(lambda m: values.get(m.group(1), m.group(0)), script)
+
+
+@lru_cache(maxsize=None)
+def _version_export() -> str:
+    """镜像版本配置（确保远程节点使用相同版本），运行期不变"""
+    docker_user = getattr(settings, 'DOCKER_USER', 'yyhuni')
+    image_tag = settings.IMAGE_TAG  # 必须有值，settings.py 启动时已校验
+    return f'export DOCKER_USER="{docker_user}"\nexport IMAGE_TAG="{image_tag}"'
+
+
 def get_bootstrap_script() -> str:
     """获取环境初始化脚本"""
     return _read_script("bootstrap.sh")
 
 
+@lru_cache(maxsize=None)
 def get_deploy_script() -> str:
     """获取安装脚本（安装 Docker + 拉取镜像）"""
-    script = _read_script("install.sh")
-    # 注入镜像版本配置（确保远程节点使用相同版本）
-    docker_user = getattr(settings, 'DOCKER_USER', 'yyhuni')
-    image_tag = settings.IMAGE_TAG  # 必须有值，settings.py 启动时已校验
-    version_export = f'export DOCKER_USER="{docker_user}"\nexport IMAGE_TAG="{image_tag}"\n'
-    # 在 set -e 后插入版本配置
-    script = script.replace('set -e\n', f'set -e\n\n{version_export}', 1)
-    return script
+    return _render_script("install.sh", VERSION_EXPORT=_version_export())
 
 
 def get_uninstall_script() -> str:
@@ -61,17 +79,15 @@ def get_start_agent_script(
     :param heartbeat_api_url: 心跳上报地址
     :param worker_id: Worker ID
     """
-    script = _read_script("start-agent.sh")
-    
-    # 替换变量
-    script = script.replace("{{HEARTBEAT_API_URL}}", heartbeat_api_url or '')
-    script = script.replace("{{WORKER_ID}}", str(worker_id) if worker_id else '')
-    
-    # 注入镜像版本配置（确保远程节点使用相同版本）
-    docker_user = getattr(settings, 'DOCKER_USER', 'yyhuni')
-    image_tag = settings.IMAGE_TAG  # 必须有值，settings.py 启动时已校验
-    version_export = f'export DOCKER_USER="{docker_user}"\nexport IMAGE_TAG="{image_tag}"\n'
-    # 在 set -e 后插入版本配置
-    script = script.replace('set -e\n', f'set -e\n\n{version_export}', 1)
-    
-    return script
+    return _render_start_agent_script(heartbeat_api_url or '', str(worker_id) if worker_id else '')
+
+
+@lru_cache(maxsize=128)
+def _render_start_agent_script(heartbeat_api_url: str, worker_id: str) -> str:
+    """按 (心跳地址, Worker ID) 缓存替换变量后的 agent 启动脚本"""
+    return _render_script(
+        "start-agent.sh",
+        HEARTBEAT_API_URL=heartbeat_api_url,
+        WORKER_ID=worker_id,
+        VERSION_EXPORT=_version_export(),
+    )
@@ -10,6 +10,7 @@
 2. 模板只读浏览
    - get_template_tree: 获取目录树结构
    - get_template_content: 获取单个模板文件内容
+   - get_template_file: 获取单个模板文件路径（纯文本下载 / ETag）
 
 注意：仓库的 CRUD 操作由 DRF ModelViewSet 默认实现，不在 Service 层处理。
 
@@ -26,6 +27,9 @@ from __future__ import annotations
 
 import logging
 import shutil
+import threading
+from concurrent.futures import Future
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
@@ -39,6 +43,22 @@ from apps.engine.repositories import NucleiTemplateRepository, TemplateFileRepos
 logger = logging.getLogger(__name__)
 
 
+# 进行中的同步：repo_id -> Future，同一仓库的并发 refresh 共享一次 Git 操作
+_refresh_inflight: Dict[int, Future] = {}
+_refresh_inflight_lock = threading.Lock()
+
+
+@lru_cache(maxsize=16)
+def _cached_template_tree(root: str, commit_hash: str, root_mtime_ns: int) -> List[Dict[str, Any]]:
+    """按 (目录, commit, 根目录 mtime) 缓存模板目录树
+
+    仓库内容只随 refresh_repo 变化，而每次同步都会记录新的 commit_hash，
+    commit 不变时直接复用上次遍历结果，避免每次请求都遍历上万个模板文件。
+    返回值由多个请求共享，调用方不可修改。
+    """
+    return TemplateFileRepository(root=Path(root)).get_tree()
+
+
 class NucleiTemplateRepoService:
     """Nuclei 多仓库业务 Service
 
@@ -161,6 +181,37 @@ class NucleiTemplateRepoService:
     # ==================== Git 同步 ====================
 
     def refresh_repo(self, repo_id: int) -> Dict[str, Any]:
+        """同步仓库（同一仓库的并发调用合并为一次 Git 操作）
+
+        并发执行两个 git pull 会争抢 .git/index.lock；这里第一个调用者执行同步，
+        同期到达的其它调用者等待并共享其结果（或异常）。
+
+        Args:
+            repo_id: 仓库 ID
+
+        Returns:
+            同 _refresh_repo
+        """
+        with _refresh_inflight_lock:
+            future = _refresh_inflight.get(repo_id)
+            owner = future is None
+            if owner:
+                future = _refresh_inflight[repo_id] = Future()
+
+        if owner:
+            try:
+                future.set_result(self._refresh_repo(repo_id))
+            except BaseException as exc:  # noqa: BLE001
+                future.set_exception(exc)
+            finally:
+                with _refresh_inflight_lock:
+                    _refresh_inflight.pop(repo_id, None)
+        else:
+            logger.info("nuclei 模板仓库 %s 正在同步，等待进行中的同步结果", repo_id)
+
+        return future.result()
+
+    def _refresh_repo(self, repo_id: int) -> Dict[str, Any]:
         """同步仓库（Git clone 或 pull）
 
         根据 local_path 是否存在 .git 目录判断：
@@ -299,9 +350,14 @@ class NucleiTemplateRepoService:
 
         Returns:
             目录树结构，详见 TemplateFileRepository.get_tree()
+            （同一 commit 的结果会被缓存复用）
         """
-        fs_repo = self._get_fs_repo(repo_id)
-        return fs_repo.get_tree()
+        obj = self._get_repo_obj(repo_id)
+        root = self.ensure_local_path(obj)
+        # 从未同步过（无 commit）时内容不可靠，不缓存
+        if not obj.commit_hash:
+            return TemplateFileRepository(root=root).get_tree()
+        return _cached_template_tree(str(root), obj.commit_hash, root.stat().st_mtime_ns)
 
     def get_template_content(self, repo_id: int, rel_path: str) -> Optional[Dict[str, Any]]:
         """获取单个模板文件内容
@@ -317,5 +373,18 @@ class NucleiTemplateRepoService:
         fs_repo = self._get_fs_repo(repo_id)
         return fs_repo.get_file_content(rel_path)
 
+    def get_template_file(self, repo_id: int, rel_path: str) -> Optional[Path]:
+        """获取单个模板文件的本地绝对路径（用于直接发送文件或计算 ETag）
+
+        Args:
+            repo_id: 仓库 ID
+            rel_path: 相对路径，如 "http/cves/CVE-2021-1234.yaml"
+
+        Returns:
+            文件绝对路径，文件不存在或路径无效返回 None
+        """
+        fs_repo = self._get_fs_repo(repo_id)
+        return fs_repo.resolve_file(rel_path)
+
 
 __all__ = ["NucleiTemplateRepoService"]
@@ -0,0 +1,192 @@
+"""
+SSH 连接池
+
+按 (host, port, user) 复用已认证的 paramiko 连接，供任务分发和 Worker 远程操作共用，
+避免每次远程命令都重新进行 TCP 握手、密钥交换和认证。
+
+使用方式：
+    # 借出连接并打开通道，池中连接已失效时自动重连一次
+    ssh, (stdin, stdout, stderr) = borrow_and_open(
+        host, port, username, password, lambda c: c.exec_command(cmd)
+    )
+    ...
+    return_ssh(host, port, username, ssh)   # 可复用
+    ssh.close()                             # 不可复用
+
+    # 自行处理重连时
+    ssh = borrow_ssh(host, port, username, password)
+    ...
+    return_ssh(host, port, username, ssh)   # 可复用
+    ssh.close()                             # 不可复用
+
+    # Worker 卸载/删除后关闭该主机的空闲连接
+    close_pool(host, port, username)
+"""
+
+import logging
+import threading
+import time
+from typing import Callable, TypeVar
+
+import paramiko
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+_SSH_POOL_MAX_PER_KEY = 4       # 每个主机最多保留的空闲连接数（限制 FD 占用和 sshd MaxSessions）
+_SSH_KEEPALIVE_SECONDS = 30     # 保活间隔，防止 NAT/防火墙回收空闲连接
+# 空闲连接最长复用时间：transport.is_active() 无法发现半开连接（对端已断开但未收到 RST），
+# 空闲超过一个保活周期的连接不再复用，直接关闭（同时回收已下线/删除 Worker 的连接和读线程）
+_SSH_IDLE_TTL_SECONDS = _SSH_KEEPALIVE_SECONDS
+
+# 禁用 DH group-exchange 密钥交换：服务端下发最长 8192 位素数，paramiko 需在 Python 中完成
+# 大数运算，握手 CPU 开销远高于 curve25519/ecdh（仍保留 group14/16 兼容老旧服务端）
+_SSH_DISABLED_ALGORITHMS = {
+    'kex': ['diffie-hellman-group-exchange-sha256', 'diffie-hellman-group-exchange-sha1'],
+}
+
+# (host, port, user) -> [(连接, 归还时间)]，按归还时间升序，末尾为最近归还（LIFO 借出）
+_ssh_pool: dict[tuple[str, int, str], list[tuple[paramiko.SSHClient, float]]] = {}
+_ssh_pool_lock = threading.Lock()
+
+
+def _close_all(clients: list[paramiko.SSHClient]) -> None:
+    for ssh in clients:
+        try:
+            ssh.close()
+        except Exception:
+            pass
+
+
+def _pop_idle(key: tuple[str, int, str]) -> paramiko.SSHClient | None:
+    """取出最近归还且未超过空闲时间的连接，顺带清理该主机下已超时的连接"""
+    stale = []
+    ssh = None
+    with _ssh_pool_lock:
+        idle = _ssh_pool.get(key)
+        if idle:
+            deadline = time.monotonic() - _SSH_IDLE_TTL_SECONDS
+            candidate, returned_at = idle.pop()
+            if returned_at >= deadline:
+                ssh = candidate
+            else:
+                # 末尾是最近归还的连接，它已超时则其余连接也都已超时
+                stale = [candidate] + [client for client, _ in idle]
+                idle.clear()
+            if not idle:
+                _ssh_pool.pop(key, None)
+    _close_all(stale)
+    return ssh
+
+
+def borrow_ssh(
+    host: str,
+    port: int,
+    username: str,
+    password: str | None,
+    fresh: bool = False,
+) -> paramiko.SSHClient:
+    """
+    从连接池借出 SSH 连接，池中无可用连接时新建
+
+    仅复用空闲时间未超过保活周期且 transport 仍存活的连接，其余直接关闭丢弃。
+    fresh=True 时跳过连接池直接新建（池中连接执行失败后重连用）。
+    """
+    key = (host, port, username)
+
+    while not fresh:
+        ssh = _pop_idle(key)
+        if ssh is None:
+            break
+        transport = ssh.get_transport()
+        if transport is not None and transport.is_active():
+            return ssh
+        ssh.close()
+
+    ssh = paramiko.SSHClient()
+    ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+    try:
+        # 连接（SSH 连接超时 10 秒足够）
+        # 配置了密码时直接密码认证，跳过本地密钥/agent 逐个尝试（每个都是一次签名 + 往返）
+        use_password = bool(password)
+        ssh.connect(
+            hostname=host,
+            port=port,
+            username=username,
+            password=password if use_password else None,
+            timeout=10,
+            # 握手/认证阶段单独限时，避免服务端卡住时阻塞调用方（默认 banner 15s、auth 30s）
+            banner_timeout=5,
+            auth_timeout=5,
+            look_for_keys=not use_password,
+            allow_agent=not use_password,
+            disabled_algorithms=_SSH_DISABLED_ALGORITHMS,
+        )
+    except Exception:
+        ssh.close()
+        raise
+    ssh.get_transport().set_keepalive(_SSH_KEEPALIVE_SECONDS)
+    logger.debug("SSH 新建连接 - %s@%s:%d", username, host, port)
+    return ssh
+
+
+def return_ssh(host: str, port: int, username: str, ssh: paramiko.SSHClient) -> None:
+    """归还 SSH 连接；连接已失效或池已满时关闭，并清理该主机下空闲超时的连接"""
+    transport = ssh.get_transport()
+    if transport is None or not transport.is_active():
+        ssh.close()
+        return
+
+    now = time.monotonic()
+    deadline = now - _SSH_IDLE_TTL_SECONDS
+    stale = []
+    with _ssh_pool_lock:
+        idle = _ssh_pool.setdefault((host, port, username), [])
+        while idle and idle[0][1] < deadline:
+            stale.append(idle.pop(0)[0])
+        if len(idle) < _SSH_POOL_MAX_PER_KEY:
+            idle.append((ssh, now))
+        else:
+            stale.append(ssh)
+    _close_all(stale)
+
+
+def close_pool(host: str, port: int, username: str) -> None:
+    """关闭并移除指定主机的所有空闲连接（Worker 卸载/删除时调用）"""
+    with _ssh_pool_lock:
+        idle = _ssh_pool.pop((host, port, username), [])
+    _close_all([client for client, _ in idle])
+    if idle:
+        logger.debug("SSH 连接池已清空 - %s@%s:%d (%d 个连接)", username, host, port, len(idle))
+
+
+def borrow_and_open(
+    host: str,
+    port: int,
+    username: str,
+    password: str | None,
+    open_channel: Callable[[paramiko.SSHClient], T],
+) -> tuple[paramiko.SSHClient, T]:
+    """
+    借出连接并执行 open_channel(ssh)（exec_command / open_sftp 等打开通道的操作）
+
+    池中连接可能已被对端断开（空闲检查无法发现半开连接），打开通道失败时丢弃并新建连接重试一次。
+    返回 (连接, open_channel 返回值)，调用方负责归还或关闭连接。
+    """
+    ssh = borrow_ssh(host, port, username, password)
+    try:
+        return ssh, open_channel(ssh)
+    except (paramiko.SSHException, EOFError, OSError) as e:
+        ssh.close()
+        logger.warning("SSH 连接已失效，重新连接 - %s@%s:%d, Error: %s", username, host, port, e)
+
+    ssh = borrow_ssh(host, port, username, password, fresh=True)
+    try:
+        return ssh, open_channel(ssh)
+    except BaseException:
+        ssh.close()
+        raise
+
+
+__all__ = ['borrow_ssh', 'return_ssh', 'borrow_and_open', 'close_pool']
@@ -24,14 +24,15 @@
 任务启动流程：
 1. Server 调用 execute_scan_flow() 等方法提交任务
 2. select_best_worker() 从 Redis 读取心跳数据，选择负载最低的节点
-3. _build_docker_command() 构建完整的 docker run 命令：
+3. _build_docker_command() 构建完整的 docker run 命令（参数列表）：
    - 设置网络（本地加入 Docker 网络，远程不指定）
    - 注入环境变量（-e SERVER_URL=...）
    - 挂载结果和日志目录（-v）
    - 指定执行脚本（python -m apps.scan.scripts.xxx）
 4. _execute_docker_command() 执行命令：
-   - 本地：subprocess.run() 直接执行
-   - 远程：paramiko SSH 执行
+   - 本地：subprocess.run() 直接执行参数列表（不经过 shell）
+   - 远程：shlex.join() 转义为命令行后通过 paramiko SSH 执行（连接池复用已认证连接）
+   两条路径使用同一份参数列表，引号/转义规则一致，模板中不依赖宿主 shell 展开
 5. docker run -d 立即返回容器 ID，任务在后台执行
 
 特点：
@@ -42,17 +43,53 @@
 - 版本一致：所有节点使用相同版本的 worker 镜像
 """
 
+import atexit
+import json
 import logging
+import random
+import shlex
+import subprocess
+import threading
 import time
-from typing import Optional, Dict, Any
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from operator import itemgetter
+from typing import NamedTuple, Optional, Dict, Any
 
 import paramiko
 from django.conf import settings
+from django.db import connection
 
 from apps.engine.models import WorkerNode
+from apps.engine.services.ssh_pool import borrow_and_open, return_ssh
 
 logger = logging.getLogger(__name__)
 
+class DispatchWorker(NamedTuple):
+    """
+    分发任务所需的 WorkerNode 字段快照（选择节点 + 构建/执行 docker 命令）
+    
+    不可变值对象：缓存的节点列表在请求线程和分发线程池之间共享，
+    不能使用 ORM 实例（延迟字段会在任意线程触发查询，属性赋值会影响其他调用方）。
+    """
+    id: int
+    name: str
+    is_local: bool
+    ip_address: str
+    ssh_port: int
+    username: str
+    password: str
+
+
+# 按 DispatchWorker 字段顺序从数据库读取
+_DISPATCH_FIELDS = DispatchWorker._fields
+
+# 删除任务类型 -> (脚本模块, ID 列表参数名)
+_DELETE_TASKS = {
+    'targets': ('apps.targets.scripts.run_delete_targets', 'target_ids'),
+    'organizations': ('apps.targets.scripts.run_delete_organizations', 'organization_ids'),
+    'scans': ('apps.scan.scripts.run_delete_scans', 'scan_ids'),
+}
+
 
 class TaskDistributor:
     """
@@ -64,13 +101,22 @@ class TaskDistributor:
     
     负载均衡策略：
     - 心跳间隔：3 秒（Agent 上报到 Redis）
-    - 任务间隔：6 秒（确保心跳已更新）
+    - 任务间隔：同一 Worker 6 秒（确保心跳已更新，Redis 按 Worker 限流）
     - 高负载阈值：85%（CPU 或内存超过则跳过）
     - 在线判断：Redis TTL（15秒过期视为离线）
     """
     
-    # 上次任务提交时间（类级别，所有实例共享）
-    _last_submit_time: float = 0
+    # 已部署 Worker 列表缓存（类级别，所有实例共享）：(节点列表, 缓存时间)
+    # 节点拓扑很少变化，WorkerNode 保存/删除时由信号接收器失效
+    WORKERS_CACHE_TTL = 5
+    _workers_cache: tuple[list[DispatchWorker], float] = ([], 0.0)
+    _workers_cache_lock = threading.Lock()
+    
+    # 删除任务合并窗口（秒）：窗口内同类删除请求合并为一个容器执行
+    DELETE_BATCH_WINDOW = 0.2
+    # task_type -> (累积的 ID, 本批次共享的 Future, 窗口定时器)
+    _pending_deletes: dict[str, tuple[list[int], Future, threading.Timer]] = {}
+    _pending_deletes_lock = threading.Lock()
     
     def __init__(self):
         self.docker_image = settings.TASK_EXECUTOR_IMAGE
@@ -79,8 +125,97 @@ class TaskDistributor:
         self.results_mount = getattr(settings, 'CONTAINER_RESULTS_MOUNT', '/app/backend/results')
         self.logs_mount = getattr(settings, 'CONTAINER_LOGS_MOUNT', '/app/backend/logs')
         self.submit_interval = getattr(settings, 'TASK_SUBMIT_INTERVAL', 5)
+        
+        # docker run 命令中与具体任务无关的部分，按 is_local 预先生成
+        self._docker_run_prefix = {
+            True: self._build_docker_run_prefix(is_local=True),
+            False: self._build_docker_run_prefix(is_local=False),
+        }
+        # (is_local, script_module) -> (固定参数列表, 容器内 sh -c 脚本中参数前/后的部分)
+        self._command_templates: dict[tuple[bool, str], tuple[tuple[str, ...], str, str]] = {}
     
-    def get_online_workers(self) -> list[WorkerNode]:
+    def _build_docker_run_prefix(self, is_local: bool) -> tuple[str, ...]:
+        """
+        构建 docker run 命令的固定前缀（网络、环境变量、挂载卷、镜像）
+        
+        容器只需要 SERVER_URL，启动后从配置中心获取完整配置。
+        """
+        # 根据 Worker 类型确定网络和 Server 地址
+        if is_local:
+            # 本地：加入 Docker 网络，使用内部服务名
+            network_args = ["--network", settings.DOCKER_NETWORK_NAME]
+            server_url = f"http://server:{settings.SERVER_PORT}"
+        else:
+            # 远程：通过 Nginx 反向代理访问（HTTPS，不直连 8888 端口）
+            network_args = []
+            server_url = f"https://{settings.PUBLIC_HOST}:{settings.PUBLIC_PORT}"
+        
+        # 挂载路径（所有节点统一使用固定路径）
+        host_results_dir = settings.HOST_RESULTS_DIR  # /opt/xingrin/results
+        host_logs_dir = settings.HOST_LOGS_DIR  # /opt/xingrin/logs
+        
+        # 环境变量：SERVER_URL + IS_LOCAL，其他配置容器启动时从配置中心获取
+        # IS_LOCAL 用于 Worker 向配置中心声明身份，决定返回的数据库地址
+        # Prefect 本地模式配置：启用 ephemeral server（本地临时服务器）
+        is_local_str = "true" if is_local else "false"
+        env_vars = [
+            "-e", f"SERVER_URL={server_url}",
+            "-e", f"IS_LOCAL={is_local_str}",
+            "-e", "PREFECT_HOME=/tmp/.prefect",  # 设置 Prefect 数据目录到可写位置
+            "-e", "PREFECT_SERVER_EPHEMERAL_ENABLED=true",  # 启用 ephemeral server（本地临时服务器）
+            "-e", "PREFECT_SERVER_EPHEMERAL_STARTUP_TIMEOUT_SECONDS=120",  # 增加启动超时时间
+            "-e", "PREFECT_SERVER_DATABASE_CONNECTION_URL=sqlite+aiosqlite:////tmp/.prefect/prefect.db",  # 使用 /tmp 下的 SQLite
+            "-e", "PREFECT_LOGGING_LEVEL=WARNING",  # 日志级别（减少 DEBUG 噪音）
+        ]
+        
+        # 挂载卷
+        volumes = [
+            "-v", f"{host_results_dir}:{self.results_mount}",
+            "-v", f"{host_logs_dir}:{self.logs_mount}",
+        ]
+        
+        # 镜像拉取策略：--pull=missing
+        # - 本地 Worker：install.sh 已预拉取镜像，直接使用本地版本
+        # - 远程 Worker：deploy 时已预拉取镜像，直接使用本地版本
+        # - 避免每次任务都检查 Docker Hub，提升性能和稳定性
+        return (
+            "docker", "run", "--rm", "-d", "--pull=missing",
+            *network_args, *env_vars, *volumes, self.docker_image,
+        )
+    
+    @classmethod
+    def invalidate_workers_cache(cls) -> None:
+        """使已部署 Worker 列表缓存失效（WorkerNode 变更时调用）"""
+        cls._workers_cache = ([], 0.0)
+    
+    def _get_deployed_workers(self) -> list[DispatchWorker]:
+        """
+        获取所有已部署的节点（online/offline 表示已部署）
+        
+        只取分发所需字段（不可变的 DispatchWorker，可在线程间安全共享）；
+        结果在进程内缓存 WORKERS_CACHE_TTL 秒，避免每次分发都查库。
+        """
+        workers, cached_at = TaskDistributor._workers_cache
+        if cached_at and time.monotonic() - cached_at < self.WORKERS_CACHE_TTL:
+            return list(workers)
+        
+        with TaskDistributor._workers_cache_lock:
+            # 双重检查：等锁期间可能已被其他线程刷新
+            workers, cached_at = TaskDistributor._workers_cache
+            if cached_at and time.monotonic() - cached_at < self.WORKERS_CACHE_TTL:
+                return list(workers)
+            
+            rows = (
+                WorkerNode.objects
+                .filter(status__in=['online', 'offline'])
+                .values_list(*_DISPATCH_FIELDS)
+            )
+            workers = [DispatchWorker(*row) for row in rows]
+            TaskDistributor._workers_cache = (workers, time.monotonic())
+        
+        return list(workers)
+    
+    def get_online_workers(self) -> list[DispatchWorker]:
         """
         获取所有在线的 Worker
         
@@ -91,17 +226,13 @@ class TaskDistributor:
         from apps.engine.services.worker_load_service import worker_load_service
         
         # 1. 获取所有已部署的节点（online/offline 表示已部署）
-        workers = WorkerNode.objects.filter(status__in=['online', 'offline'])
+        workers = self._get_deployed_workers()
         
-        # 2. 过滤出 Redis 中有心跳数据的（在线）
-        online_workers = []
-        for worker in workers:
-            if worker_load_service.is_online(worker.id):
-                online_workers.append(worker)
-        
-        return online_workers
+        # 2. 过滤出 Redis 中有心跳数据的（在线），一次 pipeline 批量检查
+        online_ids = worker_load_service.get_online_set([w.id for w in workers])
+        return [w for w in workers if w.id in online_ids]
     
-    def select_best_worker(self) -> Optional[WorkerNode]:
+    def select_best_worker(self, exclude: Optional[set[int]] = None) -> Optional[DispatchWorker]:
         """
         选择负载最低的在线 Worker
         
@@ -109,22 +240,33 @@ class TaskDistributor:
         - 从 Redis 读取实时负载数据
         - CPU 权重 70%，内存权重 30%
         - 排除 CPU > 85% 或 内存 > 85% 的机器
+        - 在正常负载节点中按 (100 - 分数) 加权随机选择：负载越低概率越高，
+          避免心跳刷新前的突发提交全部落到同一节点
+        
+        Args:
+            exclude: 不参与选择的 Worker ID（如提交间隔未到的节点）
         
         Returns:
             最优 Worker，如果没有可用的返回 None
         """
         from apps.engine.services.worker_load_service import worker_load_service
         
-        workers = self.get_online_workers()
+        # 从 Redis 批量获取负载数据：有负载数据即在线（心跳 TTL 未过期），
+        # 无需再单独检查在线状态
+        workers = self._get_deployed_workers()
+        if exclude:
+            workers = [w for w in workers if w.id not in exclude]
+            if not workers:
+                return None
+        loads = worker_load_service.get_all_loads([w.id for w in workers]) if workers else {}
         
-        if not workers:
+        if not loads:
+            if exclude:
+                # 其余节点均在提交间隔内，由调用方等待
+                return None
             logger.warning("没有可用的在线 Worker")
             return None
         
-        # 从 Redis 批量获取负载数据
-        worker_ids = [w.id for w in workers]
-        loads = worker_load_service.get_all_loads(worker_ids)
-        
         # 计算每个 Worker 的负载分数
         scored_workers = []
         high_load_workers = []  # 高负载 Worker（降级备选）
@@ -133,8 +275,7 @@ class TaskDistributor:
             # 从 Redis 获取负载数据
             load = loads.get(worker.id)
             if not load:
-                # Redis 无数据，跳过该节点（不应该发生，因为 get_online_workers 已过滤）
-                logger.warning(f"Worker {worker.name} 无负载数据，跳过")
+                # Redis 无心跳数据，视为离线
                 continue
             
             cpu = load.get('cpu', 0)
@@ -155,6 +296,9 @@ class TaskDistributor:
         
         # 降级策略：如果没有正常负载的，等待后重新选择
         if not scored_workers:
+            if exclude:
+                # 被排除的节点间隔到期后可能可用，由调用方等待，不在此进入高负载等待
+                return None
             if high_load_workers:
                 # 高负载时先等待，给系统喘息时间（默认 60 秒）
                 high_load_wait = getattr(settings, 'HIGH_LOAD_WAIT_SECONDS', 60)
@@ -163,8 +307,7 @@ class TaskDistributor:
                 
                 # 重新选择（递归调用，可能负载已降下来）
                 # 为避免无限递归，这里直接使用高负载中最低的
-                high_load_workers.sort(key=lambda x: x[1])
-                best_worker, _, cpu, mem = high_load_workers[0]
+                best_worker, _, cpu, mem = min(high_load_workers, key=itemgetter(1))
                 
                 # 发送高负载通知
                 from apps.common.signals import all_workers_high_load
@@ -181,9 +324,9 @@ class TaskDistributor:
                 logger.warning("没有可用的 Worker")
                 return None
         
-        # 选择分数最低的
-        scored_workers.sort(key=lambda x: x[1])
-        best_worker, score, cpu, mem = scored_workers[0]
+        # 按负载加权随机选择（权重下限为 1，满载节点仍有极小概率被选中）
+        weights = [max(1.0, 100.0 - score) for _, score, _, _ in scored_workers]
+        best_worker, score, cpu, mem = random.choices(scored_workers, weights=weights, k=1)[0]
         
         logger.info(
             "选择 Worker: %s (CPU: %.1f%%, MEM: %.1f%%, Score: %.1f)",
@@ -192,29 +335,51 @@ class TaskDistributor:
         
         return best_worker
     
-    def _wait_for_submit_interval(self):
+    def _select_worker_for_submit(self) -> Optional[DispatchWorker]:
         """
-        等待任务提交间隔（后台线程中执行，不阻塞 API）
+        选择 Worker 并占用其任务提交间隔（后台线程中执行，不阻塞 API）
         
-        确保连续任务提交之间有足够的间隔，让心跳有时间更新负载数据。
-        如果距上次提交已超过间隔，则不等待。
+        同一 Worker 连续提交之间需间隔 submit_interval，让心跳有时间更新负载数据；
+        不同 Worker 之间互不阻塞：选中的 Worker 间隔未到时将其排除，从其余在线节点中
+        继续选择；仅当所有候选节点都在间隔内时，才等待其中最短的剩余时间后重新选择。
         """
-        if TaskDistributor._last_submit_time > 0:
-            elapsed = time.time() - TaskDistributor._last_submit_time
-            if elapsed < self.submit_interval:
-                time.sleep(self.submit_interval - elapsed)
-        TaskDistributor._last_submit_time = time.time()
+        from apps.engine.services.worker_load_service import worker_load_service
+        
+        while True:
+            # Worker ID -> 提交间隔剩余秒数
+            throttled: dict[int, float] = {}
+            while True:
+                worker = self.select_best_worker(exclude=set(throttled))
+                if not worker:
+                    break
+                
+                wait_seconds = worker_load_service.try_acquire_submit_slot(
+                    worker.id, self.submit_interval
+                )
+                if wait_seconds <= 0:
+                    return worker
+                throttled[worker.id] = wait_seconds
+            
+            if not throttled:
+                return None
+            
+            wait_seconds = min(throttled.values())
+            logger.info(
+                "所有候选 Worker 提交间隔未到（%d 个），等待 %.1f 秒后重新选择",
+                len(throttled), wait_seconds
+            )
+            time.sleep(wait_seconds)
     
     def _build_docker_command(
         self,
-        worker: WorkerNode,
+        worker: DispatchWorker,
         script_module: str,
         script_args: Dict[str, Any],
-    ) -> str:
+    ) -> list[str]:
         """
-        构建 docker run 命令
+        构建 docker run 命令（参数列表）
         
-        容器只需要 SERVER_URL，启动后从配置中心获取完整配置。
+        固定部分按 (本地/远程, 脚本) 缓存为模板，这里只拼接脚本参数。
         
         Args:
             worker: 目标 Worker（用于区分本地/远程网络）
@@ -222,72 +387,46 @@ class TaskDistributor:
             script_args: 脚本参数（会转换为命令行参数）
         
         Returns:
-            完整的 docker run 命令
+            完整的 docker run 参数列表
         """
-        import shlex
-        
-        # 根据 Worker 类型确定网络和 Server 地址
-        if worker.is_local:
-            # 本地：加入 Docker 网络，使用内部服务名
-            network_arg = f"--network {settings.DOCKER_NETWORK_NAME}"
-            server_url = f"http://server:{settings.SERVER_PORT}"
-        else:
-            # 远程：通过 Nginx 反向代理访问（HTTPS，不直连 8888 端口）
-            network_arg = ""
-            server_url = f"https://{settings.PUBLIC_HOST}:{settings.PUBLIC_PORT}"
-        
-        # 挂载路径（所有节点统一使用固定路径）
-        host_results_dir = settings.HOST_RESULTS_DIR  # /opt/xingrin/results
-        host_logs_dir = settings.HOST_LOGS_DIR  # /opt/xingrin/logs
-        
-        # 环境变量：SERVER_URL + IS_LOCAL，其他配置容器启动时从配置中心获取
-        # IS_LOCAL 用于 Worker 向配置中心声明身份，决定返回的数据库地址
-        # Prefect 本地模式配置：启用 ephemeral server（本地临时服务器）
-        is_local_str = "true" if worker.is_local else "false"
-        env_vars = [
-            f"-e SERVER_URL={shlex.quote(server_url)}",
-            f"-e IS_LOCAL={is_local_str}",
-            "-e PREFECT_HOME=/tmp/.prefect",  # 设置 Prefect 数据目录到可写位置
-            "-e PREFECT_SERVER_EPHEMERAL_ENABLED=true",  # 启用 ephemeral server（本地临时服务器）
-            "-e PREFECT_SERVER_EPHEMERAL_STARTUP_TIMEOUT_SECONDS=120",  # 增加启动超时时间
-            "-e PREFECT_SERVER_DATABASE_CONNECTION_URL=sqlite+aiosqlite:////tmp/.prefect/prefect.db",  # 使用 /tmp 下的 SQLite
-            "-e PREFECT_LOGGING_LEVEL=WARNING",  # 日志级别（减少 DEBUG 噪音）
-        ]
-        
-        # 挂载卷
-        volumes = [
-            f"-v {host_results_dir}:{self.results_mount}",
-            f"-v {host_logs_dir}:{self.logs_mount}",
-        ]
-        
-        # 构建命令行参数
-        # 使用 shlex.quote 处理特殊字符，确保参数在 shell 中正确解析
+        # 构建脚本参数（拼入容器内的 sh -c 脚本）
+        # 使用 shlex.quote 处理特殊字符，确保参数在容器内 shell 中正确解析
         args_str = " ".join([f"--{k}={shlex.quote(str(v))}" for k, v in script_args.items()])
         
+        key = (worker.is_local, script_module)
+        template = self._command_templates.get(key)
+        if template is None:
+            template = self._command_templates[key] = self._build_command_template(*key)
+        argv, head, tail = template
+        return [*argv, f"{head}{args_str}{tail}"]
+    
+    def _build_command_template(
+        self, is_local: bool, script_module: str
+    ) -> tuple[tuple[str, ...], str, str]:
+        """
+        构建指定脚本的命令模板
+        
+        Returns:
+            (argv, head, tail) 元组，完整参数列表为 [*argv, head + 脚本参数 + tail]，
+            最后一项是容器内 sh -c 执行的脚本
+        """
         # 日志文件路径（容器内），保留最近 10000 行
         log_file = f"{self.logs_mount}/container_{script_module.split('.')[-1]}.log"
         
-        # 构建内部命令（日志轮转 + 执行脚本）
-        inner_cmd = f'tail -n 10000 {log_file} > {log_file}.tmp 2>/dev/null; mv {log_file}.tmp {log_file} 2>/dev/null; python -m {script_module} {args_str} >> {log_file} 2>&1'
-        
-        # 完整命令
-        # 镜像拉取策略：--pull=missing
-        # - 本地 Worker：install.sh 已预拉取镜像，直接使用本地版本
-        # - 远程 Worker：deploy 时已预拉取镜像，直接使用本地版本
-        # - 避免每次任务都检查 Docker Hub，提升性能和稳定性
-        # 使用双引号包裹 sh -c 命令，内部 shlex.quote 生成的单引号参数可正确解析
-        cmd = f'''docker run --rm -d --pull=missing {network_arg} \
-            {' '.join(env_vars)} \
-            {' '.join(volumes)} \
-            {self.docker_image} \
-            sh -c "{inner_cmd}"'''
-        
-        return cmd
+        # 容器内脚本（日志轮转 + 执行脚本），作为 sh -c 的单个参数传入，
+        # 由容器内的 sh 解析，与宿主/远程用户的 shell 无关
+        head = (
+            f'tail -n 10000 {log_file} > {log_file}.tmp 2>/dev/null; '
+            f'mv {log_file}.tmp {log_file} 2>/dev/null; '
+            f'python -m {script_module} '
+        )
+        tail = f' >> {log_file} 2>&1'
+        return (*self._docker_run_prefix[is_local], "sh", "-c"), head, tail
     
     def _execute_docker_command(
         self,
-        worker: WorkerNode,
-        docker_cmd: str,
+        worker: DispatchWorker,
+        docker_cmd: list[str],
     ) -> tuple[bool, str]:
         """
         在 Worker 上执行 docker run 命令
@@ -296,34 +435,35 @@ class TaskDistributor:
         
         Args:
             worker: 目标 Worker
-            docker_cmd: docker run 命令
+            docker_cmd: docker run 参数列表
         
         Returns:
             (success, container_id) 元组
         """
+        # 远程执行和日志使用同一份转义后的命令行
+        command_line = shlex.join(docker_cmd)
         logger.info("准备执行 Docker 命令 - Worker: %s, Local: %s", worker.name, worker.is_local)
-        logger.info("Docker 命令: %s", docker_cmd[:200] + '...' if len(docker_cmd) > 200 else docker_cmd)
+        logger.info("Docker 命令: %s", command_line[:200] + '...' if len(command_line) > 200 else command_line)
         
         if worker.is_local:
             return self._execute_local_docker(docker_cmd)
         else:
-            return self._execute_ssh_docker(worker, docker_cmd)
+            return self._execute_ssh_docker(worker, command_line)
     
     def _execute_local_docker(
         self,
-        docker_cmd: str,
+        docker_cmd: list[str],
     ) -> tuple[bool, str]:
         """
         在本地执行 docker run 命令
         
         docker run -d 立即返回容器 ID。
+        参数列表直接 exec docker，不经过 /bin/sh。
         """
-        import subprocess
         logger.info("开始执行本地 Docker 命令...")
         try:
             result = subprocess.run(
                 docker_cmd,
-                shell=True,
                 capture_output=True,
                 text=True,
             )
@@ -345,7 +485,7 @@ class TaskDistributor:
     
     def _execute_ssh_docker(
         self,
-        worker: WorkerNode,
+        worker: DispatchWorker,
         docker_cmd: str,
     ) -> tuple[bool, str]:
         """
@@ -355,35 +495,31 @@ class TaskDistributor:
         
         Args:
             worker: 目标 Worker
-            docker_cmd: docker run 命令
+            docker_cmd: docker run 命令行（由参数列表 shlex.join 转义得到）
         
         Returns:
             (success, container_id) 元组
         """
         ssh = None
+        reusable = False
         logger.info("开始 SSH Docker 执行 - Worker: %s (%s:%d)", worker.name, worker.ip_address, worker.ssh_port)
         try:
-            ssh = paramiko.SSHClient()
-            ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-            
-            # 连接（SSH 连接超时 10 秒足够）
-            ssh.connect(
-                hostname=worker.ip_address,
-                port=worker.ssh_port,
-                username=worker.username,
-                password=worker.password if worker.password else None,
-                timeout=10,
+            # 从连接池借出已认证的连接并执行 docker run（-d 模式立即返回），通道读超时 15 秒；
+            # 池中连接已失效时自动重连一次
+            ssh, (stdin, stdout, stderr) = borrow_and_open(
+                worker.ip_address, worker.ssh_port, worker.username, worker.password,
+                lambda client: client.exec_command(docker_cmd, timeout=15)
             )
-            logger.debug("SSH 连接成功 - Worker: %s", worker.name)
-            
-            # 执行 docker run（-d 模式立即返回）
-            stdin, stdout, stderr = ssh.exec_command(docker_cmd)
             exit_code = stdout.channel.recv_exit_status()
             
-            output = stdout.read().decode().strip()
-            error = stderr.read().decode().strip()
+            # 成功时 stdout 只有一行容器 ID
+            output = stdout.read(128).decode(errors='replace').strip()
+            # 命令正常结束（无论退出码），连接可继续复用
+            reusable = True
             
             if exit_code != 0:
+                # 仅失败时读取 stderr，且只保留用于日志/提示的部分
+                error = stderr.read(4096).decode(errors='replace').strip()
                 logger.error(
                     "SSH Docker 执行失败 - Worker: %s, Exit: %d, Stderr: %s, Stdout: %s",
                     worker.name, exit_code, error[:500], output[:500]
@@ -404,7 +540,10 @@ class TaskDistributor:
             return False, f"执行异常: {e}"
         finally:
             if ssh:
-                ssh.close()
+                if reusable:
+                    return_ssh(worker.ip_address, worker.ssh_port, worker.username, ssh)
+                else:
+                    ssh.close()
     
     def execute_scan_flow(
         self,
@@ -442,17 +581,12 @@ class TaskDistributor:
         logger.info("  docker_image: %s", self.docker_image)
         logger.info("="*60)
         
-        # 1. 等待提交间隔（后台线程执行，不阻塞 API）
-        logger.info("等待提交间隔...")
-        self._wait_for_submit_interval()
-        logger.info("提交间隔等待完成")
-        
-        # 2. 选择最佳 Worker
-        worker = self.select_best_worker()
+        # 1. 选择最佳 Worker 并占用其提交间隔（后台线程执行，不阻塞 API）
+        worker = self._select_worker_for_submit()
         if not worker:
             return False, "没有可用的 Worker", None, None
         
-        # 3. 构建 docker run 命令
+        # 2. 构建 docker run 命令
         script_args = {
             'scan_id': scan_id,
             'target_name': target_name,
@@ -474,7 +608,7 @@ class TaskDistributor:
             worker.name, scan_id, target_name
         )
         
-        # 4. 执行 docker run（本地直接执行，远程通过 SSH）
+        # 3. 执行 docker run（本地直接执行，远程通过 SSH）
         success, output = self._execute_docker_command(worker, docker_cmd)
         
         if success:
@@ -514,46 +648,67 @@ class TaskDistributor:
         
         logger.info(f"开始在 {len(workers)} 个 Worker 上执行清理任务")
         
+        # 清理命令只随本地/远程变化，每种各构建一次（清理过期扫描结果目录）
+        script_args = {
+            'results_dir': '/app/backend/results',
+            'retention_days': retention_days,
+        }
+        docker_cmds: dict[bool, list[str]] = {}
         for worker in workers:
-            try:
-                # 构建 docker run 命令（清理过期扫描结果目录）
-                script_args = {
-                    'results_dir': '/app/backend/results',
-                    'retention_days': retention_days,
-                }
-                
-                docker_cmd = self._build_docker_command(
+            if worker.is_local not in docker_cmds:
+                docker_cmds[worker.is_local] = self._build_docker_command(
                     worker=worker,
                     script_module='apps.scan.scripts.run_cleanup',
                     script_args=script_args,
                 )
-                
-                # 执行清理命令
-                success, output = self._execute_docker_command(worker, docker_cmd)
-                
-                results.append({
-                    'worker_id': worker.id,
-                    'worker_name': worker.name,
-                    'success': success,
-                    'output': output[:500] if output else None,
-                })
-                
-                if success:
-                    logger.info(f"✓ Worker {worker.name} 清理任务已启动")
-                else:
-                    logger.warning(f"✗ Worker {worker.name} 清理任务启动失败: {output}")
-                    
-            except Exception as e:
-                logger.error(f"Worker {worker.name} 清理任务执行异常: {e}")
-                results.append({
-                    'worker_id': worker.id,
-                    'worker_name': worker.name,
-                    'success': False,
-                    'error': str(e),
-                })
+        
+        # 各 Worker 相互独立且以网络 I/O 为主，并发分发
+        with ThreadPoolExecutor(max_workers=min(16, len(workers))) as executor:
+            futures = [
+                executor.submit(self._dispatch_cleanup, worker, docker_cmds[worker.is_local])
+                for worker in workers
+            ]
+            for future in as_completed(futures):
+                results.append(future.result())
         
         return results
 
+    def _dispatch_cleanup(self, worker: DispatchWorker, docker_cmd: list[str]) -> dict:
+        """
+        在单个 Worker 上启动清理任务
+        
+        Args:
+            worker: 目标 Worker
+            docker_cmd: 预先构建的清理 docker run 命令
+        
+        Returns:
+            该 Worker 的执行结果
+        """
+        try:
+            # 执行清理命令
+            success, output = self._execute_docker_command(worker, docker_cmd)
+            
+            if success:
+                logger.info(f"✓ Worker {worker.name} 清理任务已启动")
+            else:
+                logger.warning(f"✗ Worker {worker.name} 清理任务启动失败: {output}")
+            
+            return {
+                'worker_id': worker.id,
+                'worker_name': worker.name,
+                'success': success,
+                'output': output[:500] if output else None,
+            }
+                
+        except Exception as e:
+            logger.error(f"Worker {worker.name} 清理任务执行异常: {e}")
+            return {
+                'worker_id': worker.id,
+                'worker_name': worker.name,
+                'success': False,
+                'error': str(e),
+            }
+
     def execute_delete_task(
         self,
         task_type: str,
@@ -571,24 +726,10 @@ class TaskDistributor:
         Returns:
             (success, message, container_id) 元组
         """
-        import json
-        
-        # 映射任务类型到脚本
-        script_map = {
-            'targets': 'apps.targets.scripts.run_delete_targets',
-            'organizations': 'apps.targets.scripts.run_delete_organizations',
-            'scans': 'apps.scan.scripts.run_delete_scans',
-        }
-        
-        # 映射任务类型到参数名
-        param_map = {
-            'targets': 'target_ids',
-            'organizations': 'organization_ids',
-            'scans': 'scan_ids',
-        }
-        
-        if task_type not in script_map:
+        delete_task = _DELETE_TASKS.get(task_type)
+        if delete_task is None:
             return False, f"不支持的任务类型: {task_type}", None
+        script_module, param_name = delete_task
         
         # 选择最佳 Worker
         worker = self.select_best_worker()
@@ -597,13 +738,13 @@ class TaskDistributor:
         
         # 构建参数（ID 列表需要 JSON 序列化）
         script_args = {
-            param_map[task_type]: json.dumps(ids),
+            param_name: json.dumps(ids),
         }
         
         # 构建 docker run 命令
         docker_cmd = self._build_docker_command(
             worker=worker,
-            script_module=script_map[task_type],
+            script_module=script_module,
             script_args=script_args,
         )
         
@@ -629,6 +770,115 @@ class TaskDistributor:
             )
             return False, output, None
 
+    
+    def schedule_delete_task(self, task_type: str, ids: list[int]) -> Future:
+        """
+        提交删除任务（异步，短时间内的同类请求合并执行）
+        
+        逐条删除时每次都会启动一个容器；这里在 DELETE_BATCH_WINDOW 窗口内
+        累积同一 task_type 的 ID，窗口结束后由定时线程合并为一次 execute_delete_task。
+        
+        进程正常退出时未到期的批次会立即分发（atexit，有超时上限）；
+        进程被强制终止时窗口内的 ID 不会分发，记录保持软删除状态。
+        
+        Args:
+            task_type: 任务类型 ('targets', 'organizations', 'scans')
+            ids: 要删除的 ID 列表
+        
+        Returns:
+            同批次调用方共享的 Future，结果为 execute_delete_task 的 (success, message, container_id)
+        """
+        if task_type not in _DELETE_TASKS:
+            logger.warning("不支持的删除任务类型: %s", task_type)
+            future = Future()
+            future.set_result((False, f"不支持的任务类型: {task_type}", None))
+            return future
+        
+        cls = TaskDistributor
+        with cls._pending_deletes_lock:
+            pending = cls._pending_deletes.get(task_type)
+            if pending is not None:
+                # 窗口已开启，并入同一批次
+                pending[0].extend(ids)
+                return pending[1]
+            future = Future()
+            timer = threading.Timer(self.DELETE_BATCH_WINDOW, self._flush_delete_task, args=(task_type,))
+            timer.daemon = True
+            cls._pending_deletes[task_type] = (list(ids), future, timer)
+            timer.start()
+        return future
+    
+    def _flush_delete_task(self, task_type: str) -> None:
+        """
+        合并窗口结束：取出累积的 ID 并分发一个删除容器
+        
+        在定时线程或退出时的专用线程中执行（不在请求线程上运行，结束时关闭本线程的数据库连接）。
+        """
+        with TaskDistributor._pending_deletes_lock:
+            pending = TaskDistributor._pending_deletes.pop(task_type, None)
+        if pending is None:
+            return
+        ids, future, timer = pending
+        timer.cancel()
+        
+        # 去重并保持顺序
+        ids = list(dict.fromkeys(ids))
+        try:
+            try:
+                result = self.execute_delete_task(task_type, ids)
+                if not result[0]:
+                    logger.warning("硬删除任务分发失败 - 类型: %s, 数量: %d, Error: %s", task_type, len(ids), result[1])
+            except Exception as e:
+                logger.error("硬删除任务分发异常 - 类型: %s, 数量: %d, Error: %s", task_type, len(ids), e)
+                result = (False, f"分发异常: {e}", None)
+            future.set_result(result)
+        except BaseException as e:
+            # 线程被中断等情况下也要唤醒等待方
+            future.set_exception(e)
+            raise
+        finally:
+            connection.close()
+    
+    def flush_pending_deletes(self, timeout: float = 10.0) -> None:
+        """
+        立即分发所有未到期的删除批次（进程退出时调用）
+        
+        在独立线程中执行并最多等待 timeout 秒，避免 SSH 分发阻塞进程退出。
+        """
+        with TaskDistributor._pending_deletes_lock:
+            task_types = list(TaskDistributor._pending_deletes)
+        if not task_types:
+            return
+        
+        def _flush_all():
+            for task_type in task_types:
+                self._flush_delete_task(task_type)
+        
+        flusher = threading.Thread(target=_flush_all, name='delete-task-flush', daemon=True)
+        flusher.start()
+        flusher.join(timeout)
+        if flusher.is_alive():
+            logger.warning("退出前分发删除任务超时（%.0f 秒），未完成的批次将丢失: %s", timeout, task_types)
+
+
+def log_delete_task_outcome(future: Future, task_type: str, ids: list[int]) -> None:
+    """
+    schedule_delete_task 返回的 Future 完成回调：记录调用方这批 ID 的分发结果
+    
+    用法：future.add_done_callback(partial(log_delete_task_outcome, task_type=..., ids=...))
+    """
+    if future.exception() is not None:
+        logger.error("硬删除任务未分发 - 类型: %s, 数量: %d, 记录保持软删除状态", task_type, len(ids))
+        return
+    success, message, container_id = future.result()
+    if success:
+        logger.info("✓ 硬删除任务已分发 - 类型: %s, 数量: %d, Container: %s", task_type, len(ids), container_id)
+    else:
+        logger.error(
+            "硬删除任务分发失败 - 类型: %s, 数量: %d, 记录保持软删除状态: %s",
+            task_type, len(ids), message
+        )
+
 
 # 单例
 _distributor: Optional[TaskDistributor] = None
@@ -639,6 +889,8 @@ def get_task_distributor() -> TaskDistributor:
     global _distributor
     if _distributor is None:
         _distributor = TaskDistributor()
+        # 进程正常退出（如 gunicorn worker 回收）前分发合并窗口内尚未提交的删除任务
+        atexit.register(_distributor.flush_pending_deletes)
     return _distributor
 
 
@@ -25,6 +25,9 @@ class WorkerLoadService:
     # 数据过期时间（秒）- 超过此时间未更新视为离线
     # 心跳间隔 3 秒，TTL 设为 15 秒（5 次心跳容错）
     TTL_SECONDS = 15
+
+    # 任务提交间隔 Key 前缀（按 Worker 限流）
+    SUBMIT_KEY_PREFIX = "ratelimit:submit:"
     
     def __init__(self):
         self._redis: Optional[redis.Redis] = None
@@ -141,6 +144,52 @@ class WorkerLoadService:
     def is_online(self, worker_id: int) -> bool:
         """检查 Worker 是否在线（Redis 中有数据且未过期）"""
         return self.redis.exists(self._key(worker_id)) > 0
+    
+    def get_online_set(self, worker_ids: list[int]) -> set[int]:
+        """
+        批量检查 Worker 是否在线（单次 pipeline 往返）
+        
+        Args:
+            worker_ids: Worker ID 列表
+        
+        Returns:
+            在线的 Worker ID 集合
+        """
+        if not worker_ids:
+            return set()
+        
+        pipe = self.redis.pipeline(transaction=False)
+        for worker_id in worker_ids:
+            pipe.exists(self._key(worker_id))
+        
+        return {
+            worker_id
+            for worker_id, exists in zip(worker_ids, pipe.execute())
+            if exists
+        }
+
+    def try_acquire_submit_slot(self, worker_id: int, interval: float) -> float:
+        """
+        尝试占用 Worker 的任务提交间隔（SET NX PX，跨进程生效）
+
+        Args:
+            worker_id: Worker ID
+            interval: 提交间隔（秒）
+
+        Returns:
+            0 表示占用成功可立即提交；否则为需要等待的剩余秒数
+        """
+        key = f"{self.SUBMIT_KEY_PREFIX}{worker_id}"
+        try:
+            if self.redis.set(key, 1, nx=True, px=int(interval * 1000)):
+                return 0
+            remaining_ms = self.redis.pttl(key)
+        except Exception as e:
+            # Redis 异常时不阻塞任务提交
+            logger.warning(f"占用提交间隔失败 - ID: {worker_id}: {e}")
+            return 0
+        # key 恰好过期（-2）或无 TTL（-1）时，短暂等待后重试
+        return remaining_ms / 1000 if remaining_ms > 0 else 0.05
 
 
 # 单例
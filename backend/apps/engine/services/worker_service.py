@@ -25,6 +25,10 @@ class WorkerService:
         """根据 ID 获取 Worker 节点"""
         return self.repo.get_by_id(worker_id)
 
+    def get_worker_for_heartbeat(self, worker_id: int):
+        """获取心跳处理所需的 Worker 节点（仅加载必要字段）"""
+        return self.repo.get_for_heartbeat(worker_id)
+
     def get_all_workers(self):
         """获取所有 Worker 节点查询集"""
         return self.repo.get_all()
@@ -40,6 +44,19 @@ class WorkerService:
         """
         return self.repo.update_status(worker_id, status)
 
+    def compare_and_set_status(self, worker_id: int, expected: str, status: str) -> bool:
+        """仅当当前状态为 expected 时更新 Worker 状态
+        
+        Args:
+            worker_id: Worker ID
+            expected: 期望的当前状态
+            status: 新状态
+        
+        Returns:
+            是否实际更新
+        """
+        return self.repo.compare_and_set_status(worker_id, expected, status)
+
 
     def delete_worker(self, worker_id: int) -> bool:
         """删除 Worker 节点"""
@@ -90,43 +107,36 @@ class WorkerService:
             return False, "未配置 SSH 密码，跳过远程卸载"
         
         try:
-            import paramiko
             from apps.engine.services.deploy_service import get_uninstall_script
-            
-            ssh = paramiko.SSHClient()
-            ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+            from apps.engine.services.ssh_pool import borrow_and_open
             
             logger.info(f"[卸载] 正在连接 {ip_address}...")
-            ssh.connect(
-                ip_address,
-                port=ssh_port,
-                username=username,
-                password=password,
-                timeout=30
+            ssh, sftp = borrow_and_open(
+                ip_address, ssh_port, username, password, lambda client: client.open_sftp()
             )
-            
-            # 上传卸载脚本
-            uninstall_script = get_uninstall_script()
-            remote_script_path = '/tmp/xingrin_uninstall.sh'
-            
-            sftp = ssh.open_sftp()
-            with sftp.file(remote_script_path, 'w') as f:
-                f.write(uninstall_script)
-            sftp.chmod(remote_script_path, 0o755)
-            sftp.close()
-            
-            # 执行卸载脚本
-            logger.info(f"[卸载] 正在执行卸载脚本...")
-            stdin, stdout, stderr = ssh.exec_command(f"bash {remote_script_path}")
-            exit_status = stdout.channel.recv_exit_status()
-            
-            ssh.close()
+            try:
+                # 上传卸载脚本
+                uninstall_script = get_uninstall_script()
+                remote_script_path = '/tmp/xingrin_uninstall.sh'
+                
+                with sftp.file(remote_script_path, 'w') as f:
+                    f.write(uninstall_script)
+                sftp.chmod(remote_script_path, 0o755)
+                sftp.close()
+                
+                # 执行卸载脚本
+                logger.info(f"[卸载] 正在执行卸载脚本...")
+                stdin, stdout, stderr = ssh.exec_command(f"bash {remote_script_path}")
+                exit_status = stdout.channel.recv_exit_status()
+                error = stderr.read().decode().strip() if exit_status != 0 else ''
+            finally:
+                # 节点卸载后即被删除，连接不再归还连接池
+                ssh.close()
             
             if exit_status == 0:
                 logger.info(f"[卸载] Worker {worker_id} 远程卸载成功")
                 return True, "远程卸载成功"
             else:
-                error = stderr.read().decode().strip()
                 logger.warning(f"[卸载] Worker {worker_id} 远程卸载失败: {error}")
                 return False, f"远程卸载失败: {error}"
                 
@@ -159,29 +169,25 @@ class WorkerService:
             return False, "未配置 SSH 密码"
         
         try:
-            import paramiko
-            
-            ssh = paramiko.SSHClient()
-            ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+            from apps.engine.services.ssh_pool import borrow_and_open, return_ssh
             
-            ssh.connect(
-                ip_address,
-                port=ssh_port,
-                username=username,
-                password=password,
-                timeout=30
+            # 复用连接池中已认证的连接（心跳触发的更新等高频场景无需每次握手）
+            ssh, (stdin, stdout, stderr) = borrow_and_open(
+                ip_address, ssh_port, username, password,
+                lambda client: client.exec_command(command, timeout=120)
             )
-            
-            stdin, stdout, stderr = ssh.exec_command(command, timeout=120)
-            exit_status = stdout.channel.recv_exit_status()
-            
-            ssh.close()
-            
-            if exit_status == 0:
-                return True, stdout.read().decode().strip()
-            else:
-                error = stderr.read().decode().strip()
-                return False, error
+            try:
+                exit_status = stdout.channel.recv_exit_status()
+                
+                if exit_status == 0:
+                    result = True, stdout.read().decode().strip()
+                else:
+                    result = False, stderr.read().decode().strip()
+            except BaseException:
+                ssh.close()
+                raise
+            return_ssh(ip_address, ssh_port, username, ssh)
+            return result
                 
         except Exception as e:
             return False, str(e)
@@ -15,7 +15,7 @@ API 列表：
 自定义 Action：
 - POST   /api/nuclei/repos/{id}/refresh/           手动 Git 同步（clone/pull）
 - GET    /api/nuclei/repos/{id}/templates/tree/    获取当前本地模板目录树（不自动同步）
-- GET    /api/nuclei/repos/{id}/templates/content/ 获取单个模板内容（只读）
+- GET    /api/nuclei/repos/{id}/templates/content/ 获取单个模板内容（只读，支持 ETag / text/plain）
 
 调用链路：
     HTTP Request → View → Service → Repository → Model/FileSystem
@@ -26,11 +26,14 @@ from __future__ import annotations
 import logging
 
 from django.core.exceptions import ValidationError
+from django.http import FileResponse
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
 from rest_framework.request import Request
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
 
+from apps.common.renderers import PlainTextRenderer
 from apps.engine.models import NucleiTemplateRepo
 from apps.engine.serializers import NucleiTemplateRepoSerializer
 from apps.engine.services import NucleiTemplateRepoService
@@ -54,17 +57,23 @@ class NucleiTemplateRepoViewSet(viewsets.ModelViewSet):
     Attributes:
         queryset: 默认查询集，按创建时间倒序
         serializer_class: 序列化器类
-        service: Service 层实例，处理业务逻辑
+        service: Service 层实例（类级别共享），处理业务逻辑
     """
 
     # DRF ModelViewSet 配置
     queryset = NucleiTemplateRepo.objects.all().order_by("-created_at")
     serializer_class = NucleiTemplateRepoSerializer
 
-    def __init__(self, *args, **kwargs) -> None:  # type: ignore[override]
-        """初始化 ViewSet，创建 Service 实例"""
-        super().__init__(*args, **kwargs)
-        self.service = NucleiTemplateRepoService()
+    # Service 无状态，所有请求共享同一实例（DRF 每个请求都会新建 ViewSet）
+    _service: NucleiTemplateRepoService | None = None
+
+    @property
+    def service(self) -> NucleiTemplateRepoService:
+        """共享的 Service 实例（首次访问时创建；并发创建多个也无副作用）"""
+        cls = type(self)
+        if cls._service is None:
+            cls._service = NucleiTemplateRepoService()
+        return cls._service
 
     def perform_create(self, serializer) -> None:  # type: ignore[override]
         """创建仓库时初始化本地路径目录
@@ -155,17 +164,26 @@ class NucleiTemplateRepoViewSet(viewsets.ModelViewSet):
 
         return Response({"roots": roots})
 
-    @action(detail=True, methods=["get"], url_path="templates/content")
+    @action(
+        detail=True,
+        methods=["get"],
+        url_path="templates/content",
+        renderer_classes=[*api_settings.DEFAULT_RENDERER_CLASSES, PlainTextRenderer],
+    )
     def templates_content(self, request: Request, pk: str | None = None) -> Response:
         """获取单个模板文件内容
 
         GET /api/nuclei/repos/{id}/templates/content/?path=http/example.yaml
 
+        响应带 ETag（文件 mtime + 大小），If-None-Match 命中时返回 304；
+        Accept: text/plain（或 ?format=txt）时直接发送文件原文，不经过 JSON 编码。
+
         Query Parameters:
             path: 模板相对路径，如 "http/cves/CVE-2021-1234.yaml"
 
         Returns:
-            200: {"path": "...", "name": "...", "content": "..."}
+            200: {"path": "...", "name": "...", "content": "..."} 或文件原文
+            304: 内容未变化
             400: {"message": "无效的仓库 ID"} 或 {"message": "缺少 path 参数"}
             404: {"message": "模板不存在或无法读取"}
             500: {"message": "获取模板内容失败"}
@@ -183,6 +201,25 @@ class NucleiTemplateRepoViewSet(viewsets.ModelViewSet):
 
         # 调用 Service 层
         try:
+            file_path = self.service.get_template_file(repo_id, rel_path)
+            if file_path is None:
+                return Response({"message": "模板不存在或无法读取"}, status=status.HTTP_404_NOT_FOUND)
+
+            # 内容未变化时直接 304，不读取文件
+            st = file_path.stat()
+            etag = f'"{st.st_mtime_ns:x}-{st.st_size:x}"'
+            if request.headers.get("If-None-Match") == etag:
+                return Response(status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+            # 纯文本：FileResponse 直接发送文件（支持时走 sendfile）
+            if isinstance(request.accepted_renderer, PlainTextRenderer):
+                response = FileResponse(
+                    open(file_path, "rb"),
+                    content_type="text/plain; charset=utf-8",
+                )
+                response["ETag"] = etag
+                return response
+
             result = self.service.get_template_content(repo_id, rel_path)
         except ValidationError as exc:
             return Response({"message": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
@@ -193,4 +230,4 @@ class NucleiTemplateRepoViewSet(viewsets.ModelViewSet):
         # 文件不存在
         if result is None:
             return Response({"message": "模板不存在或无法读取"}, status=status.HTTP_404_NOT_FOUND)
-        return Response(result)
+        return Response(result, headers={"ETag": etag})
@@ -1,20 +1,168 @@
 """
 Worker 节点 Views
 """
+import atexit
 import os
 import threading
+import time
 import logging
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 
+from cachetools import TTLCache
+from django.conf import settings
+from django.http import Http404, HttpResponse
+from djangorestframework_camel_case.render import CamelCaseJSONRenderer
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 
+from apps.engine.models import WorkerNode
 from apps.engine.serializers import WorkerNodeSerializer
 from apps.engine.services import WorkerService
+from apps.engine.services.ssh_pool import close_pool
+from apps.engine.services.worker_load_service import worker_load_service
 from apps.common.signals import worker_delete_failed
 
 logger = logging.getLogger(__name__)
 
+# 远程 SSH 操作（卸载、agent 更新）共用的有界线程池：
+# 批量升级/删除时限制同时发起的 SSH 会话数，避免触发目标 sshd 的 MaxStartups 限制
+_REMOTE_EXECUTOR = ThreadPoolExecutor(
+    max_workers=int(os.getenv('REMOTE_SSH_CONCURRENCY', '8')),
+    thread_name_prefix='worker-remote',
+)
+# 进程退出时不等待排队中的远程操作（未开始的任务直接取消，锁按 TTL 自然过期）
+atexit.register(_REMOTE_EXECUTOR.shutdown, wait=False, cancel_futures=True)
+
+# 远程 agent 更新锁（同一 worker 同时只允许一次更新）
+AGENT_UPDATE_LOCK_TTL = 60
+
+# 锁值为持有者 token，释放/续期前先校验，避免误删/误续其他持有者的锁
+_RELEASE_LOCK_LUA = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+_EXTEND_LOCK_LUA = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('pexpire', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+# 进程内更新标记：本进程刚触发过更新的 worker 在锁有效期内直接跳过，省去一次 Redis 往返
+# （TTL 略短于锁 TTL，标记过期后回落到 Redis 锁判断）
+_LOCAL_UPDATE_MARKS = TTLCache(maxsize=10000, ttl=AGENT_UPDATE_LOCK_TTL - 5)
+_LOCAL_UPDATE_MARKS_LOCK = threading.Lock()
+
+# 本进程持有的更新锁 lock_key -> token，由单个续期线程统一续期
+# （更新耗时可能超过锁 TTL，如 docker pull 较慢；排队等待执行期间锁同样需要续期）
+_held_update_locks: dict[str, str] = {}
+_held_update_locks_lock = threading.Lock()
+_lock_keeper: threading.Thread | None = None
+
+
+def _keep_update_locks() -> None:
+    """每半个 TTL 续期一次本进程持有的全部更新锁（常驻守护线程）"""
+    extend_lock = worker_load_service.redis.register_script(_EXTEND_LOCK_LUA)
+    while True:
+        time.sleep(AGENT_UPDATE_LOCK_TTL / 2)
+        with _held_update_locks_lock:
+            held = list(_held_update_locks.items())
+        for lock_key, token in held:
+            try:
+                if not extend_lock(keys=[lock_key], args=[token, AGENT_UPDATE_LOCK_TTL * 1000]):
+                    # 锁已过期或被他人持有，不再续期
+                    _release_held_lock(lock_key, token)
+            except Exception as e:
+                logger.warning("更新锁续期失败 - %s: %s", lock_key, e)
+
+
+def _hold_update_lock(lock_key: str, token: str) -> None:
+    """登记本进程持有的更新锁，按需启动续期线程"""
+    global _lock_keeper
+    with _held_update_locks_lock:
+        _held_update_locks[lock_key] = token
+        if _lock_keeper is None:
+            _lock_keeper = threading.Thread(
+                target=_keep_update_locks, name='agent-update-lock-keeper', daemon=True
+            )
+            _lock_keeper.start()
+
+
+def _release_held_lock(lock_key: str, token: str) -> None:
+    """取消登记（仅当登记的仍是同一持有者）"""
+    with _held_update_locks_lock:
+        if _held_update_locks.get(lock_key) == token:
+            del _held_update_locks[lock_key]
+
+
+@lru_cache(maxsize=2)
+def _build_worker_config(is_local_worker: bool) -> dict:
+    """
+    构建任务容器配置（配置中心 API 返回内容）
+    
+    配置只取决于 settings 和环境变量，进程内不会变化，按 Worker 类型各构建一次。
+    返回值由多个请求共享，调用方不可修改。
+    """
+    db = settings.DATABASES['default']
+    
+    # 根据请求来源返回不同的数据库地址
+    db_host = db['HOST']
+    _is_internal_db = db_host in ('postgres', 'localhost', '127.0.0.1')
+    
+    if _is_internal_db:
+        # 本地数据库场景
+        if is_local_worker:
+            # 本地 Worker：直接用 Docker 内部服务名
+            worker_db_host = 'postgres'
+            worker_redis_url = 'redis://redis:6379/0'
+        else:
+            # 远程 Worker：通过公网 IP 访问
+            public_host = settings.PUBLIC_HOST
+            if public_host in ('server', 'localhost', '127.0.0.1'):
+                logger.warning("远程 Worker 请求配置，但 PUBLIC_HOST=%s 不是有效的公网地址", public_host)
+            worker_db_host = public_host
+            worker_redis_url = f'redis://{public_host}:6379/0'
+    else:
+        # 远程数据库场景：所有 Worker 都用 DB_HOST
+        worker_db_host = db_host
+        worker_redis_url = getattr(settings, 'WORKER_REDIS_URL', 'redis://redis:6379/0')
+    
+    logger.info(
+        "Worker 配置 - is_local_worker: %s, is_internal_db: %s, db_host: %s, redis_url: %s",
+        is_local_worker, _is_internal_db, worker_db_host, worker_redis_url
+    )
+    
+    return {
+        'db': {
+            'host': worker_db_host,
+            'port': str(db['PORT']),
+            'name': db['NAME'],
+            'user': db['USER'],
+            'password': db['PASSWORD'],
+        },
+        'redisUrl': worker_redis_url,
+        'paths': {
+            'results': getattr(settings, 'CONTAINER_RESULTS_MOUNT', '/app/backend/results'),
+            'logs': getattr(settings, 'CONTAINER_LOGS_MOUNT', '/app/backend/logs'),
+        },
+        'logging': {
+            'level': os.getenv('LOG_LEVEL', 'INFO'),
+            'enableCommandLogging': os.getenv('ENABLE_COMMAND_LOGGING', 'true').lower() == 'true',
+        },
+        'debug': settings.DEBUG
+    }
+
+
+@lru_cache(maxsize=2)
+def _render_worker_config(is_local_worker: bool) -> bytes:
+    """按 Worker 类型预渲染配置中心响应体（与默认 camelCase 渲染器输出一致）"""
+    return CamelCaseJSONRenderer().render(_build_worker_config(is_local_worker))
+
 
 class WorkerNodeViewSet(viewsets.ModelViewSet):
     """
@@ -46,7 +194,6 @@ class WorkerNodeViewSet(viewsets.ModelViewSet):
         
         # 仅在 list 操作时批量预加载
         if self.action == 'list':
-            from apps.engine.services.worker_load_service import worker_load_service
             queryset = self.get_queryset()
             worker_ids = list(queryset.values_list('id', flat=True))
             context['loads'] = worker_load_service.get_all_loads(worker_ids)
@@ -73,7 +220,6 @@ class WorkerNodeViewSet(viewsets.ModelViewSet):
         password = worker.password
         
         # 1. 删除 Redis 中的负载数据
-        from apps.engine.services.worker_load_service import worker_load_service
         worker_load_service.delete_load(worker_id)
         
         # 2. 删除数据库记录（立即生效，前端刷新时不会再看到）
@@ -106,9 +252,12 @@ class WorkerNodeViewSet(viewsets.ModelViewSet):
                     worker_name=worker_name,
                     message=str(e)
                 )
+            finally:
+                # 节点已删除，关闭连接池中该主机的空闲 SSH 连接
+                close_pool(ip_address, ssh_port, username)
         
-        # 2. 后台线程执行远程卸载（不阻塞响应）
-        threading.Thread(target=_async_remote_uninstall, daemon=True).start()
+        # 2. 后台线程池执行远程卸载（不阻塞响应）
+        _REMOTE_EXECUTOR.submit(_async_remote_uninstall)
         
         # 3. 立即返回成功
         return Response(
@@ -146,10 +295,15 @@ class WorkerNodeViewSet(viewsets.ModelViewSet):
         │ 版本匹配                    │ updating/outdated → online            │
         └─────────────────────────────┴───────────────────────────────────────┘
         """
-        from apps.engine.services.worker_load_service import worker_load_service
-        from django.conf import settings
-        
-        worker = self.get_object()
+        # 心跳为高频接口，直接按主键读取必要字段，不走 get_object() 的完整查询集
+        try:
+            worker = self.worker_service.get_worker_for_heartbeat(int(pk))
+        except (TypeError, ValueError):
+            worker = None
+        if worker is None:
+            raise Http404
+        # 与 get_object() 一致执行对象级权限检查
+        self.check_object_permissions(request, worker)
         info = request.data if request.data else {}
         
         # 1. 写入 Redis（实时负载数据，TTL=60秒）
@@ -157,10 +311,14 @@ class WorkerNodeViewSet(viewsets.ModelViewSet):
         mem = info.get('memory_percent', 0)
         worker_load_service.update_load(worker.id, cpu, mem)
         
-        # 2. 首次心跳：更新状态为 online
-        if worker.status not in ('online', 'offline'):
-            worker.status = 'online'
-            worker.save(update_fields=['status'])
+        # 2. 计算目标状态，最后至多写一次数据库（稳态心跳不写库）
+        old_status = worker.status
+        new_status = old_status
+        trigger_remote_update = False
+        
+        # 首次心跳：更新状态为 online
+        if new_status not in ('online', 'offline'):
+            new_status = 'online'
         
         # 3. 版本检查：比较 agent 版本与 server 版本
         agent_version = info.get('version', '')
@@ -172,23 +330,29 @@ class WorkerNodeViewSet(viewsets.ModelViewSet):
             need_update = agent_version != server_version
             if need_update:
                 logger.info(
-                    f"Worker {worker.name} 版本不匹配: agent={agent_version}, server={server_version}"
+                    "Worker %s 版本不匹配: agent=%s, server=%s",
+                    worker.name, agent_version, server_version
                 )
                 
                 # 远程 Worker：服务端主动通过 SSH 触发更新
                 if not worker.is_local and worker.ip_address:
-                    self._trigger_remote_agent_update(worker, server_version)
+                    trigger_remote_update = True
                 else:
                     # 本地 Worker 版本不匹配：标记为 outdated
                     # 需要用户手动执行 update.sh 更新
-                    if worker.status != 'outdated':
-                        worker.status = 'outdated'
-                        worker.save(update_fields=['status'])
+                    new_status = 'outdated'
             else:
                 # 版本匹配，确保状态为 online
-                if worker.status in ('updating', 'outdated'):
-                    worker.status = 'online'
-                    worker.save(update_fields=['status'])
+                if new_status in ('updating', 'outdated'):
+                    new_status = 'online'
+        
+        # 条件更新：仅当状态仍为读取时的值才写入，不覆盖后台更新线程同期写入的状态
+        if new_status != old_status:
+            self.worker_service.compare_and_set_status(worker.id, old_status, new_status)
+        
+        # 远程更新会把状态置为 updating，需在上面的状态写入之后触发
+        if trigger_remote_update:
+            self._trigger_remote_agent_update(worker, server_version)
         
         return Response({
             'status': 'ok',
@@ -200,19 +364,26 @@ class WorkerNodeViewSet(viewsets.ModelViewSet):
         """
         通过 SSH 触发远程 agent 更新（后台执行，不阻塞心跳响应）
         
-        使用 Redis 锁防止重复触发（同一 worker 60秒内只触发一次）
+        使用 Redis 锁防止重复触发（同一 worker 同时只进行一次更新，锁带持有者 token）
         """
-        import redis
-        from django.conf import settings as django_settings
+        # 本进程已在更新该 worker，无需再访问 Redis
+        with _LOCAL_UPDATE_MARKS_LOCK:
+            if worker.id in _LOCAL_UPDATE_MARKS:
+                return
         
-        redis_url = f"redis://{django_settings.REDIS_HOST}:{django_settings.REDIS_PORT}/{django_settings.REDIS_DB}"
-        redis_client = redis.from_url(redis_url)
+        # 复用负载服务的 Redis 连接（进程内单例连接池），避免每次心跳新建客户端和 TCP 连接
+        redis_client = worker_load_service.redis
         lock_key = f"agent_update_lock:{worker.id}"
         
-        # 尝试获取锁（60秒过期，防止重复触发）
-        if not redis_client.set(lock_key, "1", nx=True, ex=60):
-            logger.debug(f"Worker {worker.name} 更新已在进行中，跳过")
+        # 尝试获取锁（60秒过期，防止重复触发；更新完成前由续期线程续期）
+        token = uuid.uuid4().hex
+        if not redis_client.set(lock_key, token, nx=True, ex=AGENT_UPDATE_LOCK_TTL):
+            logger.debug("Worker %s 更新已在进行中，跳过", worker.name)
             return
+        with _LOCAL_UPDATE_MARKS_LOCK:
+            _LOCAL_UPDATE_MARKS[worker.id] = True
+        _hold_update_lock(lock_key, token)
+        release_lock = redis_client.register_script(_RELEASE_LOCK_LUA)
         
         # 获取锁成功，设置状态为 updating
         self._set_worker_status(worker.id, 'updating')
@@ -227,10 +398,10 @@ class WorkerNodeViewSet(viewsets.ModelViewSet):
         
         def _async_update():
             try:
-                logger.info(f"开始远程更新 Worker {worker_name} 到 {target_version}")
+                logger.info("开始远程更新 Worker %s 到 %s", worker_name, target_version)
                 
                 # 构建更新命令：拉取新镜像并重启 agent
-                docker_user = getattr(django_settings, 'DOCKER_USER', 'yyhuni')
+                docker_user = getattr(settings, 'DOCKER_USER', 'yyhuni')
                 update_cmd = f'''
                     docker pull {docker_user}/xingrin-agent:{target_version} && \
                     docker stop xingrin-agent 2>/dev/null || true && \
@@ -238,7 +409,7 @@ class WorkerNodeViewSet(viewsets.ModelViewSet):
                     docker run -d --pull=always \
                         --name xingrin-agent \
                         --restart always \
-                        -e HEARTBEAT_API_URL="https://{django_settings.PUBLIC_HOST}:{getattr(django_settings, 'PUBLIC_PORT', '8083')}" \
+                        -e HEARTBEAT_API_URL="https://{settings.PUBLIC_HOST}:{getattr(settings, 'PUBLIC_PORT', '8083')}" \
                         -e WORKER_ID="{worker_id}" \
                         -e IMAGE_TAG="{target_version}" \
                         -v /proc:/host/proc:ro \
@@ -254,30 +425,35 @@ class WorkerNodeViewSet(viewsets.ModelViewSet):
                 )
                 
                 if success:
-                    logger.info(f"Worker {worker_name} 远程更新成功")
+                    logger.info("Worker %s 远程更新成功", worker_name)
                     # 更新成功后，新 agent 心跳会自动把状态改回 online
                 else:
-                    logger.warning(f"Worker {worker_name} 远程更新失败: {message}")
+                    logger.warning("Worker %s 远程更新失败: %s", worker_name, message)
                     # 更新失败，标记为 outdated
                     self._set_worker_status(worker_id, 'outdated')
                     
             except Exception as e:
-                logger.error(f"Worker {worker_name} 远程更新异常: {e}")
+                logger.error("Worker %s 远程更新异常: %s", worker_name, e)
                 self._set_worker_status(worker_id, 'outdated')
             finally:
-                # 释放锁
-                redis_client.delete(lock_key)
-        
-        # 后台执行，不阻塞心跳响应
-        threading.Thread(target=_async_update, daemon=True).start()
+                # 停止续期并释放锁（仅当锁仍归本次更新持有）
+                _release_held_lock(lock_key, token)
+                with _LOCAL_UPDATE_MARKS_LOCK:
+                    _LOCAL_UPDATE_MARKS.pop(worker_id, None)
+                try:
+                    release_lock(keys=[lock_key], args=[token])
+                except Exception as e:
+                    logger.warning("Worker %s 释放更新锁失败: %s", worker_name, e)
+        
+        # 后台线程池执行，不阻塞心跳响应
+        _REMOTE_EXECUTOR.submit(_async_update)
     
     def _set_worker_status(self, worker_id: int, status: str):
         """更新 Worker 状态（用于后台线程）"""
         try:
-            from apps.engine.models import WorkerNode
             WorkerNode.objects.filter(id=worker_id).update(status=status)
         except Exception as e:
-            logger.error(f"更新 Worker {worker_id} 状态失败: {e}")
+            logger.error("更新 Worker %s 状态失败: %s", worker_id, e)
     
     @action(detail=False, methods=['post'])
     def register(self, request):
@@ -342,60 +518,12 @@ class WorkerNodeViewSet(viewsets.ModelViewSet):
             - 本地 Worker (is_local=true): db_host=postgres, redis=redis:6379
             - 远程 Worker (is_local=false): db_host=PUBLIC_HOST, redis=PUBLIC_HOST:6379
         """
-        from django.conf import settings
-        import logging
-        logger = logging.getLogger(__name__)
-        
         # 从请求参数获取 Worker 身份（由 Worker 自己声明）
         # 不再依赖 IP 判断，避免不同网络环境下的兼容性问题
         is_local_param = request.query_params.get('is_local', '').lower()
         is_local_worker = is_local_param == 'true'
         
-        # 根据请求来源返回不同的数据库地址
-        db_host = settings.DATABASES['default']['HOST']
-        _is_internal_db = db_host in ('postgres', 'localhost', '127.0.0.1')
+        logger.debug("Worker 配置请求 - is_local_param: %s, is_local_worker: %s", is_local_param, is_local_worker)
         
-        logger.info(
-            "Worker 配置请求 - is_local_param: %s, is_local_worker: %s, db_host: %s, is_internal_db: %s",
-            is_local_param, is_local_worker, db_host, _is_internal_db
-        )
-        
-        if _is_internal_db:
-            # 本地数据库场景
-            if is_local_worker:
-                # 本地 Worker：直接用 Docker 内部服务名
-                worker_db_host = 'postgres'
-                worker_redis_url = 'redis://redis:6379/0'
-            else:
-                # 远程 Worker：通过公网 IP 访问
-                public_host = settings.PUBLIC_HOST
-                if public_host in ('server', 'localhost', '127.0.0.1'):
-                    logger.warning("远程 Worker 请求配置，但 PUBLIC_HOST=%s 不是有效的公网地址", public_host)
-                worker_db_host = public_host
-                worker_redis_url = f'redis://{public_host}:6379/0'
-        else:
-            # 远程数据库场景：所有 Worker 都用 DB_HOST
-            worker_db_host = db_host
-            worker_redis_url = getattr(settings, 'WORKER_REDIS_URL', 'redis://redis:6379/0')
-        
-        logger.info("返回 Worker 配置 - db_host: %s, redis_url: %s", worker_db_host, worker_redis_url)
-        
-        return Response({
-            'db': {
-                'host': worker_db_host,
-                'port': str(settings.DATABASES['default']['PORT']),
-                'name': settings.DATABASES['default']['NAME'],
-                'user': settings.DATABASES['default']['USER'],
-                'password': settings.DATABASES['default']['PASSWORD'],
-            },
-            'redisUrl': worker_redis_url,
-            'paths': {
-                'results': getattr(settings, 'CONTAINER_RESULTS_MOUNT', '/app/backend/results'),
-                'logs': getattr(settings, 'CONTAINER_LOGS_MOUNT', '/app/backend/logs'),
-            },
-            'logging': {
-                'level': os.getenv('LOG_LEVEL', 'INFO'),
-                'enableCommandLogging': os.getenv('ENABLE_COMMAND_LOGGING', 'true').lower() == 'true',
-            },
-            'debug': settings.DEBUG
-        })
+        # 直接返回预渲染的 JSON，跳过每次请求的内容协商和序列化
+        return HttpResponse(_render_worker_config(is_local_worker), content_type='application/json')
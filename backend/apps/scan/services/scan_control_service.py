@@ -8,6 +8,7 @@
 
 import logging
 import threading
+from functools import partial
 from typing import Dict, List
 from django.db import transaction, connection
 from django.db.utils import DatabaseError, OperationalError
@@ -188,21 +189,16 @@ class ScanControlService:
         
         # 2. 分发硬删除任务
         try:
-            from apps.engine.services.task_distributor import get_task_distributor
+            from apps.engine.services.task_distributor import get_task_distributor, log_delete_task_outcome
             
-            distributor = get_task_distributor()
-            success, message, container_id = distributor.execute_delete_task(
-                task_type='scans',
-                ids=scan_ids
-            )
-            
-            if success:
-                logger.info(f"✓ 硬删除任务已分发 - Container: {container_id}")
-            else:
-                logger.warning(f"硬删除任务分发失败: {message}")
+            # 分发器后台合并同类删除请求，以单个容器执行
+            future = get_task_distributor().schedule_delete_task(task_type='scans', ids=scan_ids)
+            # 分发完成后记录结果（失败时记录保持软删除状态）
+            future.add_done_callback(partial(log_delete_task_outcome, task_type='scans', ids=scan_ids))
+            logger.info(f"✓ 硬删除任务已排队 - 数量: {len(scan_ids)}")
             
         except Exception as e:
-            logger.error(f"❌ 分发删除任务失败: {e}", exc_info=True)
+            logger.error(f"❌ 硬删除任务排队失败: {e}", exc_info=True)
     
     def stop_scan(self, scan_id: int) -> tuple[bool, int]:
         """
@@ -10,6 +10,7 @@
 import uuid
 import logging
 import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import List
 from datetime import datetime
 from pathlib import Path
@@ -41,6 +42,9 @@ class ScanCreationService:
     - 处理创建过程中的错误
     """
     
+    # 批量分发的最大并发数（同一 Worker 仍受分发器提交间隔约束）
+    MAX_PARALLEL_DISPATCH = 4
+    
     def __init__(self):
         """
         初始化服务
@@ -263,6 +267,9 @@ class ScanCreationService:
         """
         后台线程：分发扫描任务到 Workers
         
+        分发器按 Worker 限制提交间隔，不同 Worker 之间互不阻塞，
+        因此批量任务并发分发，总耗时不再随任务数线性累加等待和 SSH 延迟。
+        
         Args:
             scan_data: 扫描任务数据列表
         """
@@ -274,58 +281,77 @@ class ScanCreationService:
         connection.close()
         logger.info("已关闭旧数据库连接，准备获取新连接")
         
+        if not scan_data:
+            return
+        
         distributor = get_task_distributor()
         logger.info("TaskDistributor 初始化完成")
         
         scan_repo = DjangoScanRepository()
         logger.info("ScanRepository 初始化完成")
         
-        for data in scan_data:
-            scan_id = data['scan_id']
-            logger.info("-"*40)
-            logger.info("准备分发扫描任务 - Scan ID: %s, Target: %s", scan_id, data['target_name'])
-            try:
-                logger.info("调用 distributor.execute_scan_flow...")
-                success, message, container_id, worker_id = distributor.execute_scan_flow(
-                    scan_id=scan_id,
-                    target_name=data['target_name'],
-                    target_id=data['target_id'],
-                    scan_workspace_dir=data['results_dir'],
-                    engine_name=data['engine_name'],
-                    scheduled_scan_name=data.get('scheduled_scan_name'),
-                )
-                
+        max_workers = min(len(scan_data), self.MAX_PARALLEL_DISPATCH)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for data in scan_data:
+                executor.submit(self._dispatch_scan, distributor, scan_repo, data)
+    
+    def _dispatch_scan(self, distributor, scan_repo: DjangoScanRepository, data: dict):
+        """
+        分发单个扫描任务并记录结果（在分发线程池中执行）
+        
+        Args:
+            distributor: 任务分发器
+            scan_repo: 扫描仓储
+            data: 扫描任务数据
+        """
+        scan_id = data['scan_id']
+        logger.info("-"*40)
+        logger.info("准备分发扫描任务 - Scan ID: %s, Target: %s", scan_id, data['target_name'])
+        try:
+            logger.info("调用 distributor.execute_scan_flow...")
+            success, message, container_id, worker_id = distributor.execute_scan_flow(
+                scan_id=scan_id,
+                target_name=data['target_name'],
+                target_id=data['target_id'],
+                scan_workspace_dir=data['results_dir'],
+                engine_name=data['engine_name'],
+                scheduled_scan_name=data.get('scheduled_scan_name'),
+            )
+            
+            logger.info(
+                "execute_scan_flow 返回 - success: %s, message: %s, container_id: %s, worker_id: %s",
+                success, message, container_id, worker_id
+            )
+            
+            if success:
+                if container_id:
+                    scan_repo.append_container_id(scan_id, container_id)
+                    logger.info("已记录 container_id: %s", container_id)
+                if worker_id:
+                    scan_repo.update_worker(scan_id, worker_id)
+                    logger.info("已记录 worker_id: %s", worker_id)
                 logger.info(
-                    "execute_scan_flow 返回 - success: %s, message: %s, container_id: %s, worker_id: %s",
-                    success, message, container_id, worker_id
+                    "✓ 扫描任务已提交 - Scan ID: %s, Worker: %s",
+                    scan_id, worker_id
                 )
+            else:
+                logger.error("execute_scan_flow 返回失败 - message: %s", message)
+                raise Exception(message)
                 
-                if success:
-                    if container_id:
-                        scan_repo.append_container_id(scan_id, container_id)
-                        logger.info("已记录 container_id: %s", container_id)
-                    if worker_id:
-                        scan_repo.update_worker(scan_id, worker_id)
-                        logger.info("已记录 worker_id: %s", worker_id)
-                    logger.info(
-                        "✓ 扫描任务已提交 - Scan ID: %s, Worker: %s",
-                        scan_id, worker_id
-                    )
-                else:
-                    logger.error("execute_scan_flow 返回失败 - message: %s", message)
-                    raise Exception(message)
-                    
-            except Exception as e:
-                logger.error("提交扫描任务失败 - Scan ID: %s, 错误: %s", scan_id, e)
-                logger.exception("详细堆栈:")
-                try:
-                    scan_repo.update_status(
-                        scan_id,
-                        ScanStatus.FAILED,
-                        error_message=f'提交任务失败: {e}',
-                    )
-                except (DatabaseError, OperationalError) as save_error:
-                    logger.error("更新状态失败 - Scan ID: %s, 错误: %s", scan_id, save_error)
+        except Exception as e:
+            logger.error("提交扫描任务失败 - Scan ID: %s, 错误: %s", scan_id, e)
+            logger.exception("详细堆栈:")
+            try:
+                scan_repo.update_status(
+                    scan_id,
+                    ScanStatus.FAILED,
+                    error_message=f'提交任务失败: {e}',
+                )
+            except (DatabaseError, OperationalError) as save_error:
+                logger.error("更新状态失败 - Scan ID: %s, 错误: %s", scan_id, save_error)
+        finally:
+            # 线程池线程各自持有数据库连接，用完即关闭
+            connection.close()
 
 
 # 导出接口
@@ -99,7 +99,7 @@ class ScheduledScanService:
         if not dto.engine_id:
             raise ValidationError('必须选择扫描引擎')
         
-        if not self.engine_repo.get_by_id(dto.engine_id):
+        if not self.engine_repo.exists(dto.engine_id):
             raise ValidationError(f'扫描引擎 ID {dto.engine_id} 不存在')
         
         # 验证扫描模式（organization_id 和 target_id 互斥）
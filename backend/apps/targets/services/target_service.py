@@ -5,6 +5,7 @@ Target 业务逻辑服务层（Service）
 """
 
 import logging
+from functools import partial
 from typing import List, Tuple, Dict, Any, Optional
 
 from django.db import transaction
@@ -254,24 +255,17 @@ class TargetService:
         
         logger.info(f"✓ 软删除完成: {soft_count} 个目标")
         
-        # 3. 使用 task_distributor 分发硬删除任务到 Worker
+        # 3. 提交硬删除任务（分发器后台合并同类请求并选择 Worker，不阻塞 API）
         try:
-            from apps.engine.services.task_distributor import get_task_distributor
-            
-            distributor = get_task_distributor()
-            success, message, container_id = distributor.execute_delete_task(
-                task_type='targets',
-                ids=target_ids
-            )
-            
-            if success:
-                logger.info(f"✓ 硬删除任务已分发 - Container: {container_id}")
-            else:
-                logger.warning(f"硬删除任务分发失败: {message}")
+            from apps.engine.services.task_distributor import get_task_distributor, log_delete_task_outcome
             
+            future = get_task_distributor().schedule_delete_task(task_type='targets', ids=target_ids)
+            # 分发完成后记录结果（失败时记录保持软删除状态）
+            future.add_done_callback(partial(log_delete_task_outcome, task_type='targets', ids=target_ids))
+            logger.info(f"✓ 硬删除任务已排队 - 数量: {len(target_ids)}")
         except Exception as e:
-            logger.error(f"❌ 分发删除任务失败: {e}", exc_info=True)
-            logger.warning("硬删除可能未成功提交，请检查 Worker 状态")
+            logger.error(f"❌ 硬删除任务排队失败: {e}", exc_info=True)
+            logger.warning("硬删除未提交，记录保持软删除状态")
         
         return {
             'soft_deleted_count': soft_count,
@@ -11,6 +11,9 @@
 环境变量：
 - LOG_LEVEL: 全局日志级别 (DEBUG/INFO/WARNING/ERROR/CRITICAL)
 - LOG_DIR: 日志文件目录（留空则不输出文件）
+- LOG_REDIS_RING: 是否将最近日志写入 Redis 环形缓冲（默认关闭），
+  开启后系统日志 API 直接从 Redis 读取，无需访问日志文件
+  （由 settings.py 解析后通过 redis_ring 参数传入，保证与 settings.LOG_REDIS_RING 一致）
 
 开发环境特性：
 - 默认 DEBUG 级别
@@ -38,16 +41,65 @@
 - 这是 Django 配置模块的常见模式
 """
 
+import logging
 import os
+import time
 from pathlib import Path
 
+# Redis 环形缓冲：保存最近 N 条格式化后的日志（LPUSH，最新在前）
+REDIS_LOG_RING_KEY = 'xingrin:logs:ring'
+REDIS_LOG_RING_MAX_LEN = 10000
 
-def get_logging_config(debug: bool = False):
+
+class RedisRingHandler(logging.Handler):
+    """
+    将格式化后的日志写入 Redis LIST（LPUSH + LTRIM），保留最近 max_len 条
+    
+    Redis 不可用时暂停写入一段时间，避免每条日志都阻塞在连接超时上。
+    """
+    
+    RETRY_INTERVAL = 30  # Redis 故障后暂停写入的秒数
+    
+    def __init__(self, url: str, key: str = REDIS_LOG_RING_KEY,
+                 max_len: int = REDIS_LOG_RING_MAX_LEN, level=logging.NOTSET):
+        super().__init__(level)
+        self.url = url
+        self.key = key
+        self.max_len = max_len
+        self._client = None
+        self._retry_at = 0.0
+    
+    def _get_client(self):
+        """懒加载 Redis 连接（短超时，避免拖慢业务日志）"""
+        if self._client is None:
+            import redis
+            self._client = redis.Redis.from_url(
+                self.url, socket_timeout=0.5, socket_connect_timeout=0.5
+            )
+        return self._client
+    
+    def emit(self, record):
+        if self._retry_at and time.monotonic() < self._retry_at:
+            return
+        try:
+            msg = self.format(record)
+            pipe = self._get_client().pipeline(transaction=False)
+            pipe.lpush(self.key, msg)
+            pipe.ltrim(self.key, 0, self.max_len - 1)
+            pipe.execute()
+            self._retry_at = 0.0
+        except Exception:
+            self._retry_at = time.monotonic() + self.RETRY_INTERVAL
+            self.handleError(record)
+
+
+def get_logging_config(debug: bool = False, redis_ring: bool = False):
     """
     获取日志配置字典
     
     Args:
         debug: 是否为 DEBUG 模式
+        redis_ring: 是否启用 Redis 环形缓冲 handler（由 settings.LOG_REDIS_RING 传入）
     
     Returns:
         dict: Django LOGGING 配置字典
@@ -115,6 +167,20 @@ def get_logging_config(debug: bool = False):
             'encoding': 'utf-8',
         }
     
+    # Redis 环形缓冲（供系统日志 API 读取）
+    if redis_ring:
+        redis_url = 'redis://{}:{}/{}'.format(
+            os.getenv('REDIS_HOST', 'localhost'),
+            os.getenv('REDIS_PORT', '6379'),
+            os.getenv('REDIS_DB', '0'),
+        )
+        log_handlers.append('redis_ring')
+        logging_handlers['redis_ring'] = {
+            '()': RedisRingHandler,
+            'formatter': 'standard',
+            'url': redis_url,
+        }
+    
     # 构建完整的 LOGGING 配置
     logging_config = {
         'version': 1,
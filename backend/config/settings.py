@@ -252,6 +252,17 @@ CHANNEL_LAYERS = {
     },
 }
 
+# ==================== 缓存配置 ====================
+# Django 缓存（Redis 后端，多进程/多容器共享），用于查询结果缓存
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': f'redis://{REDIS_HOST}:{REDIS_PORT}/{REDIS_DB}',
+        'KEY_PREFIX': 'xingrin',
+        'TIMEOUT': 300,
+    },
+}
+
 # ==================== 日志配置 ====================
 # 日志配置说明：
 # 1. 开发环境（DEBUG=True）：
@@ -267,10 +278,14 @@ CHANNEL_LAYERS = {
 # 3. 环境变量控制：
 #    - LOG_LEVEL: 全局日志级别（DEBUG/INFO/WARNING/ERROR/CRITICAL）
 #    - LOG_DIR: 日志文件目录（留空则不输出文件）
+#    - LOG_REDIS_RING: 最近日志写入 Redis 环形缓冲，系统日志 API 优先从中读取
 #
 from config.logging_config import get_logging_config
 
-LOGGING = get_logging_config(debug=DEBUG)
+# Redis 环形缓冲开关：只在此处解析一次，同时控制日志 handler 和系统日志 API 的读取来源
+LOG_REDIS_RING = get_bool_env('LOG_REDIS_RING', False)
+
+LOGGING = get_logging_config(debug=DEBUG, redis_ring=LOG_REDIS_RING)
 
 # 命令执行日志开关（供 apps.scan.utils.command_executor 使用）
 ENABLE_COMMAND_LOGGING = get_bool_env('ENABLE_COMMAND_LOGGING', True)
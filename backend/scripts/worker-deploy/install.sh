@@ -17,6 +17,9 @@
 
 set -e
 
+# 镜像版本配置（由服务端注入）
+{{VERSION_EXPORT}}
+
 MARKER_DIR="/opt/xingrin"
 DOCKER_MARKER="${MARKER_DIR}/.docker_installed"
 
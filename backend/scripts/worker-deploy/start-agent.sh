@@ -16,6 +16,9 @@
 
 set -e
 
+# 镜像版本配置（由服务端注入）
+{{VERSION_EXPORT}}
+
 MARKER_DIR="/opt/xingrin"
 CONTAINER_NAME="xingrin-agent"
 # 使用轻量 agent 镜像（~30MB），仅包含心跳上报功能